@@ -1,8 +1,10 @@
 """Grade open-ended answers using Ollama."""
 import logging
 
+from ai.batch_runner import Job, run_jobs
 from ai.ollama_client import ask
-from ai.json_utils import parse_ai_json_dict
+from ai.json_utils import parse_ai_json_batch, parse_ai_json_dict
+from config.settings import GRADE_BATCH_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -18,24 +20,113 @@ Return ONLY valid JSON:
 Be generous with partial credit for answers that show understanding.
 Return ONLY the JSON, no other text."""
 
+BATCH_GRADING_PROMPT = """You are grading several student answers. For each numbered item,
+compare the student's answer to the correct answer.
 
-def grade(question_text, correct_answer, student_answer, node_description):
-    """Grade an open-ended answer via Ollama.
+Return ONLY a valid JSON array with one object per item, in the same order:
+[
+  {"index": 1, "is_correct": true, "partial_score": 0.85, "feedback": "Explanation of what was right/wrong"},
+  {"index": 2, "is_correct": false, "partial_score": 0.0, "feedback": "Explanation of what was right/wrong"}
+]
 
-    Returns (is_correct, partial_score, feedback, model, prompt).
-    """
-    user_prompt = f"""Question: {question_text}
+Be generous with partial credit for answers that show understanding.
+Return ONLY the JSON array, no other text."""
+
+
+def _grading_user_prompt(question_text, correct_answer, student_answer,
+                         node_description):
+    return f"""Question: {question_text}
 Correct answer: {correct_answer}
 Student answer: {student_answer}
 Topic context: {node_description}
 
 Grade this answer. Return JSON only."""
 
-    text, model, prompt = ask(GRADING_PROMPT, user_prompt, temperature=0.3)
-    result = parse_ai_json_dict(text)
 
+def _parse_grade(text):
+    """Coerce a grading response into (is_correct, partial_score, feedback)."""
+    return _coerce_grade(parse_ai_json_dict(text))
+
+
+def _coerce_grade(result):
     is_correct = bool(result.get('is_correct', False))
     partial_score = float(result.get('partial_score', 1.0 if is_correct else 0.0))
     feedback = result.get('feedback', '')
 
+    return is_correct, partial_score, feedback
+
+
+def grade(question_text, correct_answer, student_answer, node_description):
+    """Grade an open-ended answer via Ollama.
+
+    Returns (is_correct, partial_score, feedback, model, prompt).
+    """
+    user_prompt = _grading_user_prompt(question_text, correct_answer,
+                                       student_answer, node_description)
+
+    text, model, prompt = ask(GRADING_PROMPT, user_prompt, temperature=0.3)
+    is_correct, partial_score, feedback = _parse_grade(text)
+
     return is_correct, partial_score, feedback, model, prompt
+
+
+def grade_many(items):
+    """Grade several open-ended answers with concurrent Ollama requests.
+
+    Args:
+        items: iterable of (question_text, correct_answer, student_answer,
+            node_description) tuples.
+
+    Returns a list of (is_correct, partial_score, feedback, model, prompt),
+    one per item, in input order.
+    """
+    user_prompts = [_grading_user_prompt(*item) for item in items]
+    responses = run_jobs(Job(GRADING_PROMPT, u, kwargs={'temperature': 0.3})
+                         for u in user_prompts)
+    return [_parse_grade(text) + (model, prompt)
+            for text, model, prompt in responses]
+
+
+def grade_batch(items, batch_size=GRADE_BATCH_SIZE):
+    """Grade many answers with one Ollama call per chunk of batch_size.
+
+    Packs the chunk into a single prompt with [index] markers so the system
+    prompt and request overhead are paid once per chunk instead of once per
+    answer. Items the model leaves out of its array are re-graded one by one.
+
+    Args:
+        items: list of (question_text, correct_answer, student_answer,
+            node_description) tuples.
+
+    Returns a list of (is_correct, partial_score, feedback, model, prompt)
+    in input order.
+    """
+    items = list(items)
+    results = []
+    for start in range(0, len(items), max(1, batch_size)):
+        chunk = items[start:start + max(1, batch_size)]
+        blocks = [
+            f"[{i}] Question: {q}\n"
+            f"    Correct answer: {correct}\n"
+            f"    Student answer: {student}\n"
+            f"    Topic context: {desc}"
+            for i, (q, correct, student, desc) in enumerate(chunk, 1)
+        ]
+        user_prompt = ("Grade each answer. Return a JSON array in order.\n\n"
+                       + "\n".join(blocks))
+
+        text, model, prompt = ask(BATCH_GRADING_PROMPT, user_prompt,
+                                  max_tokens=256 * len(chunk), temperature=0.3)
+        try:
+            verdicts = parse_ai_json_batch(text, len(chunk))
+        except ValueError:
+            logger.warning('Batch grading returned unparseable JSON, '
+                           'grading %d items individually', len(chunk))
+            verdicts = {}
+
+        for i, item in enumerate(chunk, 1):
+            if i in verdicts:
+                results.append(_coerce_grade(verdicts[i]) + (model, prompt))
+            else:
+                results.append(grade(*item))
+    return results
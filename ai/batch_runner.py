@@ -0,0 +1,46 @@
+"""Run many Ollama chat jobs, grouped by model to avoid reload churn.
+
+Ollama keeps a limited number of models resident; alternating between
+models makes it unload and reload weights on every switch. Jobs are
+dispatched one model at a time through ollama_client.ask_many, so each
+group runs concurrently up to OLLAMA_NUM_PARALLEL, and results come back
+in input order.
+"""
+from collections import namedtuple
+from itertools import groupby
+
+from ai import ollama_client
+from config.settings import OLLAMA_MODEL
+
+# model=None means OLLAMA_MODEL; kwargs are passed through to ask()
+# (max_tokens, temperature).
+Job = namedtuple('Job', ['system_prompt', 'user_prompt', 'model', 'kwargs'],
+                 defaults=(None, None))
+
+
+def run_jobs(jobs):
+    """Run chat jobs grouped by model.
+
+    Within a model, jobs sharing a system prompt and options go to
+    ask_many together.
+
+    Returns a list of (response_text, model_used, full_prompt), one per
+    job, in input order.
+    """
+    jobs = list(jobs)
+    results = [None] * len(jobs)
+
+    def group_of(i):
+        job = jobs[i]
+        return (job.model or OLLAMA_MODEL, job.system_prompt,
+                tuple(sorted((job.kwargs or {}).items())))
+
+    order = sorted(range(len(jobs)), key=group_of)
+    for (model, system_prompt, kwargs), group in groupby(order, key=group_of):
+        indices = list(group)
+        responses = ollama_client.ask_many(
+            system_prompt, [jobs[i].user_prompt for i in indices],
+            model=model, **dict(kwargs))
+        for i, response in zip(indices, responses):
+            results[i] = response
+    return results
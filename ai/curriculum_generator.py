@@ -1,7 +1,7 @@
 """Generate a structured curriculum for any topic via Ollama."""
 import logging
 
-from ai.ollama_client import ask
+from ai.ollama_client import ask_until_json_closes
 from ai.json_utils import parse_ai_json
 
 logger = logging.getLogger(__name__)
@@ -39,19 +39,22 @@ def generate_curriculum(topic_name):
     Returns (topic_description, list_of_node_dicts, model_used, prompt_used).
     """
     user_prompt = f"Create a learning curriculum for: {topic_name}"
-    response_text, model, prompt = ask(SYSTEM_PROMPT, user_prompt, max_tokens=2048)
+    response_text, model, prompt = ask_until_json_closes(SYSTEM_PROMPT, user_prompt,
+                                                         max_tokens=2048)
     data = parse_ai_json(response_text)
 
     nodes = data.get('nodes', [])
-    node_names = [n['name'] for n in nodes]
+    # First index wins on duplicate names, as list.index() did
+    name_to_idx = {}
+    for i, n in enumerate(nodes):
+        name_to_idx.setdefault(n['name'], i)
 
     # Resolve prerequisite names to indices
     for node in nodes:
-        resolved = []
-        for prereq_name in node.get('prerequisites', []):
-            if prereq_name in node_names:
-                resolved.append(node_names.index(prereq_name))
-        node['prerequisite_indices'] = resolved
+        node['prerequisite_indices'] = [
+            name_to_idx[p] for p in node.get('prerequisites', [])
+            if p in name_to_idx
+        ]
 
     logger.info('Generated curriculum for "%s": %d nodes', topic_name, len(nodes))
     return data.get('topic_description', ''), nodes, model, prompt
@@ -5,6 +5,22 @@ This ensures distractors are always valid (not wrong answers from LLM).
 import random
 import re
 
+LETTER_PREFIX_RE = re.compile(r'^[A-Da-d][).\s]+\s*')
+_FRAC_RE = re.compile(r'\\frac\{(\d+)\}\{(\d+)\}')
+_SQRT_RE = re.compile(r'sqrt\((\d+)\)', re.IGNORECASE)
+_POW_RE = re.compile(r'(\d+)\s*\^\s*(\d+)')
+_NUM_IN_PART_RE = re.compile(r'-?\d+\.?\d*')
+
+# Answer types we can't build sensible fallback distractors for
+_HEBREW_RE = re.compile(r'[\u0590-\u05FF]')
+_ARABIC_RE = re.compile(r'[\u0600-\u06FF]')
+_CHINESE_RE = re.compile(r'[\u4e00-\u9fff]')
+_CJK_RE = re.compile(r'[\u3040-\u309F\uAC00-\uD7AF]')  # Japanese, Korean
+_LATEX_CMD_RE = re.compile(r'\\[a-z]+\{')
+
+# Marks "not parsed yet" for the _num pass-through (None means "not numeric")
+_UNPARSED = object()
+
 
 def compute_distractors(correct_answer, num_options=4):
     """Compute plausible distractors for a numeric or simple text answer.
@@ -16,9 +32,6 @@ def compute_distractors(correct_answer, num_options=4):
 
     Returns list of distractor strings (without letter prefixes).
     """
-    import re
-    LETTER_PREFIX_RE = re.compile(r'^[A-Da-d][).\s]+\s*')
-
     # Strip any existing letter prefix first
     correct_str = LETTER_PREFIX_RE.sub('', str(correct_answer)).strip()
 
@@ -33,7 +46,8 @@ def compute_distractors(correct_answer, num_options=4):
     # Ensure we have enough distractors (avoid duplicates)
     attempts = 0
     while len(distractors) < num_options - 1 and attempts < 10:
-        new_distractor = _fallback_distractor(correct_str, exclude=set(distractors) | {correct_str})
+        new_distractor = _fallback_distractor(correct_str, exclude=set(distractors) | {correct_str},
+                                              _num=num)
         if new_distractor not in distractors and new_distractor != correct_str:
             distractors.append(new_distractor)
         attempts += 1
@@ -56,7 +70,7 @@ def _parse_number(text):
             return None
 
     # Handle LaTeX fractions: \frac{1}{2}
-    m = re.search(r'\\frac\{(\d+)\}\{(\d+)\}', text)
+    m = _FRAC_RE.search(text)
     if m:
         try:
             return float(m.group(1)) / float(m.group(2))
@@ -65,12 +79,12 @@ def _parse_number(text):
 
     # Handle simple expressions: sqrt(16), 2^2
     if 'sqrt' in text.lower():
-        m = re.search(r'sqrt\((\d+)\)', text, re.IGNORECASE)
+        m = _SQRT_RE.search(text)
         if m:
             return float(m.group(1)) ** 0.5
 
     if '^' in text:
-        m = re.search(r'(\d+)\s*\^\s*(\d+)', text)
+        m = _POW_RE.search(text)
         if m:
             try:
                 return float(m.group(1)) ** float(m.group(2))
@@ -87,6 +101,13 @@ def _parse_number(text):
 def _numeric_distractors(correct):
     """Generate numeric distractors based on the correct answer."""
     distractors = []
+    seen = set()
+
+    def add(d):
+        if d not in seen:
+            seen.add(d)
+            distractors.append(d)
+
     is_integer = (correct == int(correct))
     is_negative = correct < 0
 
@@ -99,34 +120,26 @@ def _numeric_distractors(correct):
     for delta in [step, -step, step * 2, -step * 2]:
         val = correct + delta
         if val != correct and val >= 0:  # Avoid negative for age/count questions
-            d = _format_number(val, is_integer)
-            if d not in distractors:
-                distractors.append(d)
+            add(_format_number(val, is_integer))
 
     # Strategy 2: multiplication/division errors
     if correct != 0:
         for mult in [2, 0.5]:
             val = correct * mult
             if val != correct and val >= 0:
-                d = _format_number(val, is_integer)
-                if d not in distractors:
-                    distractors.append(d)
+                add(_format_number(val, is_integer))
 
     # Strategy 3: common computation errors (addition vs subtraction)
     if abs(correct) > 5:
         val = correct + random.choice([-1, 1]) * random.randint(1, 3)
         if val != correct and val >= 0:
-            d = _format_number(val, is_integer)
-            if d not in distractors:
-                distractors.append(d)
+            add(_format_number(val, is_integer))
 
     # Strategy 4: random nearby numbers
     for _ in range(3):
         val = correct + random.randint(-int(max(5, abs(correct))), int(max(5, abs(correct))))
         if val != correct and val >= 0:
-            d = _format_number(val, is_integer)
-            if d not in distractors:
-                distractors.append(d)
+            add(_format_number(val, is_integer))
 
     return distractors
 
@@ -135,8 +148,12 @@ def _format_number(num, is_integer):
     """Format a number appropriately."""
     if is_integer or num == int(num):
         return str(int(num))
-    # Round to 2 decimal places for clean display
-    return f"{num:.2f}".rstrip('0').rstrip('.')
+    # Round to 2 decimal places for clean display; str() of a float is its
+    # shortest repr, so trailing zeros never appear
+    rounded = round(num, 2)
+    if rounded == int(rounded):
+        return str(int(rounded))
+    return str(rounded)
 
 
 def _multi_value_distractors(correct):
@@ -149,6 +166,12 @@ def _multi_value_distractors(correct):
     - Only second value
     """
     distractors = []
+    seen = {correct}
+
+    def add(d):
+        if d not in seen:
+            seen.add(d)
+            distractors.append(d)
 
     # Parse comma-separated values
     parts = [p.strip() for p in correct.split(',')]
@@ -159,7 +182,7 @@ def _multi_value_distractors(correct):
     nums = []
     for part in parts:
         # Extract just the number part (e.g., "2" from "x=2")
-        m = re.search(r'-?\d+\.?\d*', part)
+        m = _NUM_IN_PART_RE.search(part)
         if m:
             nums.append(float(m.group()))
         else:
@@ -180,27 +203,20 @@ def _multi_value_distractors(correct):
             else:
                 variant_parts.append(str(int(new_num)) if new_num == int(new_num) else str(new_num))
         variant = ', '.join(variant_parts)
-        if variant != correct:
-            distractors.append(variant)
+        add(variant)
 
     # Strategy 2: Swapped order
     if len(nums) == 2:
         swapped_parts = [parts[1], parts[0]]
-        swapped = ', '.join(swapped_parts)
-        if swapped != correct:
-            distractors.append(swapped)
+        add(', '.join(swapped_parts))
 
     # Strategy 3: Only first value
     if len(nums) >= 2:
-        first_only = parts[0]
-        if first_only != correct:
-            distractors.append(first_only)
+        add(parts[0])
 
     # Strategy 4: Only second value
     if len(nums) >= 2:
-        second_only = parts[1]
-        if second_only != correct:
-            distractors.append(second_only)
+        add(parts[1])
 
     return distractors
 
@@ -238,7 +254,7 @@ def _text_distractors(correct):
     return distractors
 
 
-def _smart_fallback(correct, exclude=None):
+def _smart_fallback(correct, exclude=None, _num=_UNPARSED):
     """Generate fallback distractor or return None if impossible.
 
     Detects non-Latin scripts, LaTeX, and other complex answer types
@@ -247,6 +263,7 @@ def _smart_fallback(correct, exclude=None):
     Args:
         correct: The correct answer
         exclude: Set of values to exclude
+        _num: Already-parsed _parse_number(correct), if the caller has it
 
     Returns:
         A sensible fallback string, or None if cannot generate meaningful distractor
@@ -255,13 +272,13 @@ def _smart_fallback(correct, exclude=None):
         exclude = set()
 
     # Detect non-Latin scripts where we can't generate meaningful distractors
-    has_hebrew = bool(re.search(r'[\u0590-\u05FF]', correct))
-    has_arabic = bool(re.search(r'[\u0600-\u06FF]', correct))
-    has_chinese = bool(re.search(r'[\u4e00-\u9fff]', correct))
-    has_CJK = bool(re.search(r'[\u3040-\u309F\uAC00-\uD7AF]', correct))  # Japanese, Korean
+    has_hebrew = bool(_HEBREW_RE.search(correct))
+    has_arabic = bool(_ARABIC_RE.search(correct))
+    has_chinese = bool(_CHINESE_RE.search(correct))
+    has_CJK = bool(_CJK_RE.search(correct))
 
     # Detect LaTeX/math notation
-    has_latex = bool(re.search(r'\\[a-z]+\{', correct))
+    has_latex = bool(_LATEX_CMD_RE.search(correct))
     has_math_symbols = any(s in correct for s in ['≥', '≤', '÷', '×', 'π', '∑', '∫'])
 
     # If complex answer type, we can't generate sensible fallbacks
@@ -269,7 +286,7 @@ def _smart_fallback(correct, exclude=None):
         return None
 
     # For simple text/numeric answers, use regular fallbacks
-    num = _parse_number(correct)
+    num = _parse_number(correct) if _num is _UNPARSED else _num
     if num is not None:
         for i in [1, 2, 3, 4, -1, -2, -3, -4]:
             val = num + i
@@ -286,7 +303,7 @@ def _smart_fallback(correct, exclude=None):
     return None
 
 
-def _fallback_distractor(correct, exclude=None):
+def _fallback_distractor(correct, exclude=None, _num=_UNPARSED):
     """Generate a fallback distractor when others fail.
 
     Calls _smart_fallback() which returns None if impossible.
@@ -294,11 +311,12 @@ def _fallback_distractor(correct, exclude=None):
     Args:
         correct: The correct answer (to avoid)
         exclude: Set of values to exclude
+        _num: Already-parsed _parse_number(correct), if the caller has it
 
     Returns:
         A fallback string, or None if cannot generate meaningful one
     """
-    return _smart_fallback(correct, exclude)
+    return _smart_fallback(correct, exclude, _num)
 
 
 def insert_distractors(question_data):
@@ -311,9 +329,6 @@ def insert_distractors(question_data):
         (question_data, success: bool, reason: str) tuple.
         success=False if distractors cannot be generated meaningfully.
     """
-    import re
-    LETTER_PREFIX_RE = re.compile(r'^[A-Da-d][).\s]+\s*')
-
     q_type = question_data.get('question_type', 'mcq')
     if q_type != 'mcq':
         return question_data, True, ''
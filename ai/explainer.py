@@ -1,8 +1,10 @@
 """Generate explanations for wrong answers."""
 import logging
 
+from ai.batch_runner import Job, run_jobs
 from ai.ollama_client import ask
-from ai.json_utils import parse_ai_json_dict
+from ai.json_utils import parse_ai_json_batch, parse_ai_json_dict
+from config.settings import GRADE_BATCH_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -18,14 +20,26 @@ Return ONLY valid JSON:
 
 Return ONLY the JSON, no other text."""
 
+BATCH_EXPLAIN_PROMPT = """You are a patient tutor reviewing several wrong answers after a quiz.
+For each numbered item, explain the correct solution.
 
-def explain(question_text, correct_answer, student_answer,
-            node_name, node_description):
-    """Generate an explanation for a wrong answer.
+Return ONLY a valid JSON array with one object per item, in the same order:
+[
+  {
+    "index": 1,
+    "encouragement": "Brief positive message",
+    "explanation": "Clear step-by-step explanation of the correct solution",
+    "key_concept": "The core concept the student should understand",
+    "tip": "A practical tip for similar questions"
+  }
+]
 
-    Returns (explanation_dict, model, prompt).
-    """
-    user_prompt = f"""The student got this wrong:
+Return ONLY the JSON array, no other text."""
+
+
+def _explain_user_prompt(question_text, correct_answer, student_answer,
+                         node_name, node_description):
+    return f"""The student got this wrong:
 Question: {question_text}
 Student's answer: {student_answer}
 Correct answer: {correct_answer}
@@ -33,5 +47,77 @@ Concept: {node_name} — {node_description}
 
 Explain clearly. Return JSON only."""
 
+
+def explain(question_text, correct_answer, student_answer,
+            node_name, node_description):
+    """Generate an explanation for a wrong answer.
+
+    Returns (explanation_dict, model, prompt).
+    """
+    user_prompt = _explain_user_prompt(question_text, correct_answer,
+                                       student_answer, node_name,
+                                       node_description)
+
     text, model, prompt = ask(EXPLAIN_PROMPT, user_prompt, temperature=0.5)
     return parse_ai_json_dict(text), model, prompt
+
+
+def explain_many(items):
+    """Generate explanations for several wrong answers concurrently.
+
+    Args:
+        items: iterable of (question_text, correct_answer, student_answer,
+            node_name, node_description) tuples.
+
+    Returns a list of (explanation_dict, model, prompt) in input order.
+    """
+    user_prompts = [_explain_user_prompt(*item) for item in items]
+    responses = run_jobs(Job(EXPLAIN_PROMPT, u, kwargs={'temperature': 0.5})
+                         for u in user_prompts)
+    return [(parse_ai_json_dict(text), model, prompt)
+            for text, model, prompt in responses]
+
+
+def explain_batch(items, batch_size=GRADE_BATCH_SIZE):
+    """Explain many wrong answers with one Ollama call per chunk.
+
+    Used for bulk post-quiz review. Items missing from the model's array
+    are explained individually.
+
+    Args:
+        items: list of (question_text, correct_answer, student_answer,
+            node_name, node_description) tuples.
+
+    Returns a list of (explanation_dict, model, prompt) in input order.
+    """
+    items = list(items)
+    results = []
+    for start in range(0, len(items), max(1, batch_size)):
+        chunk = items[start:start + max(1, batch_size)]
+        blocks = [
+            f"[{i}] Question: {q}\n"
+            f"    Student's answer: {student}\n"
+            f"    Correct answer: {correct}\n"
+            f"    Concept: {name} — {desc}"
+            for i, (q, correct, student, name, desc) in enumerate(chunk, 1)
+        ]
+        user_prompt = ("The student got these wrong. Explain each one. "
+                       "Return a JSON array in order.\n\n" + "\n".join(blocks))
+
+        text, model, prompt = ask(BATCH_EXPLAIN_PROMPT, user_prompt,
+                                  max_tokens=384 * len(chunk), temperature=0.5)
+        try:
+            by_index = parse_ai_json_batch(text, len(chunk))
+        except ValueError:
+            logger.warning('Batch explain returned unparseable JSON, '
+                           'explaining %d items individually', len(chunk))
+            by_index = {}
+
+        for i, item in enumerate(chunk, 1):
+            if i in by_index:
+                entry = dict(by_index[i])
+                entry.pop('index', None)
+                results.append((entry, model, prompt))
+            else:
+                results.append(explain(*item))
+    return results
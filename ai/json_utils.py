@@ -1,7 +1,63 @@
 """Parse JSON from AI responses, handling markdown code blocks."""
+import functools
 import json
 import re
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used without it
+    orjson = None
+
+
+# A backslash pair (kept as-is) or a lone backslash not escaping a quote.
+# Both alternatives are replaced by two backslashes, so pairs are unchanged
+# and lone backslashes get doubled; \" never matches and is preserved.
+_BAD_ESCAPE_RE = re.compile(r'\\\\|\\(?=[^"])')
+
+_MD_BLOCK_RE = re.compile(r'```(?:json)?\s*\n(.*?)\n```', re.DOTALL)
+
+# A comma right before a closing bracket: {"a": 1,} / [1, 2,]
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+
+# 19+ digits may be an integer past 64 bits, which orjson turns into a float
+_LONG_DIGITS_RE = re.compile(r'\d{19}')
+
+# Opening positions tried per bracket type when extracting embedded JSON
+_MAX_SPAN_STARTS = 5
+
+
+def fast_loads(data):
+    """json.loads (str or bytes), via orjson when it is installed.
+
+    Falls back to json.loads whenever orjson rejects the input (NaN, lone
+    surrogates), and errors are still json.JSONDecodeError. Meant for the
+    Ollama wire envelope: orjson may turn integers wider than 64 bits into
+    floats, so model-authored JSON keeps going through json.loads.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def fast_dumps(obj):
+    """Serialize obj to compact UTF-8 JSON bytes, via orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def _loads_exact(text):
+    """fast_loads for model-authored JSON, keeping every integer exact.
+
+    Text with a 19+ digit run goes straight to json.loads.
+    """
+    if _LONG_DIGITS_RE.search(text):
+        return json.loads(text)
+    return fast_loads(text)
+
 
 def _fix_latex_escapes(text):
     r"""Fix invalid JSON escape sequences from LLM output (LaTeX, etc.).
@@ -10,36 +66,13 @@ def _fix_latex_escapes(text):
     contains invalid escapes. LLMs produce LaTeX like \(\sqrt{16}\) and
     \times inside JSON string values — these are invalid JSON escapes.
 
-    Strategy: walk the text character by character. For every \X sequence:
+    Strategy: one regex pass over the text. For every \X sequence:
     - Keep \" (JSON string delimiter — must stay)
     - Keep \\ (already escaped backslash)
     - Double-escape everything else: \( → \\(, \t → \\t, \s → \\s
       This treats them as literal characters, not JSON escapes.
     """
-    result = []
-    i = 0
-    n = len(text)
-    while i < n:
-        if text[i] == '\\' and i + 1 < n:
-            next_char = text[i + 1]
-            if next_char == '"':
-                # \" is structural JSON — preserve
-                result.append('\\"')
-                i += 2
-            elif next_char == '\\':
-                # \\ already escaped — preserve
-                result.append('\\\\')
-                i += 2
-            else:
-                # Invalid or ambiguous escape (\t, \n, \(, \s, etc.)
-                # Double the backslash so json.loads treats it as literal
-                result.append('\\\\')
-                result.append(next_char)
-                i += 2
-        else:
-            result.append(text[i])
-            i += 1
-    return ''.join(result)
+    return _BAD_ESCAPE_RE.sub(r'\\\\', text)
 
 
 def parse_ai_json(text):
@@ -50,45 +83,152 @@ def parse_ai_json(text):
     - JSON wrapped in ```json ... ``` blocks
     - JSON wrapped in ``` ... ``` blocks
     - Invalid escape sequences from LaTeX (e.g. \\( \\) \\sqrt \\times)
+    - Trailing commas before a closing bracket
     """
     cleaned = text.strip()
 
     # Try raw parse first
     try:
-        return json.loads(cleaned)
+        return _loads_exact(cleaned)
     except json.JSONDecodeError:
         pass
 
-    # Try with fixed LaTeX escapes
-    try:
-        return json.loads(_fix_latex_escapes(cleaned))
-    except json.JSONDecodeError:
-        pass
+    # No object/array delimiters anywhere: nothing to repair or extract,
+    # so skip the LaTeX fix-up and regex scans over (possibly long) prose.
+    if '{' not in cleaned and '[' not in cleaned:
+        raise json.JSONDecodeError("No valid JSON found in response", cleaned, 0)
+
+    # Repair/extraction path is cached: retries and deterministic
+    # regenerations often return the exact same malformed payload.
+    return json.loads(_parse_repaired(cleaned))
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_repaired(cleaned):
+    """Run the repair/extraction cascade; return the result re-serialized.
+
+    Returns a JSON string rather than the parsed object so cached results
+    can't be mutated by callers.
+    """
+    # Try with fixed LaTeX escapes, then also without trailing commas
+    for attempt_text in _repair_candidates(cleaned)[1:]:
+        try:
+            return json.dumps(json.loads(attempt_text))
+        except json.JSONDecodeError:
+            continue
 
     # Extract from markdown code block
-    match = re.search(r'```(?:json)?\s*\n(.*?)\n```', cleaned, re.DOTALL)
+    match = _MD_BLOCK_RE.search(cleaned)
     if match:
         block = match.group(1).strip()
-        for attempt_text in [block, _fix_latex_escapes(block)]:
+        for attempt_text in _repair_candidates(block):
             try:
-                return json.loads(attempt_text)
+                return json.dumps(json.loads(attempt_text))
             except json.JSONDecodeError:
                 continue
 
-    # Try to find JSON object or array in the text
-    for pattern in [r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', r'\[.*\]']:
-        match = re.search(pattern, cleaned, re.DOTALL)
-        if match:
-            raw = match.group(0)
-            for attempt_text in [raw, _fix_latex_escapes(raw)]:
-                try:
-                    return json.loads(attempt_text)
-                except json.JSONDecodeError:
-                    continue
+    # Try to find a JSON object or array embedded in the text, starting
+    # with whichever bracket type appears first
+    firsts = sorted(i for i in (cleaned.find('{'), cleaned.find('[')) if i != -1)
+    for first in firsts:
+        opener = cleaned[first]
+        start = first
+        for _ in range(_MAX_SPAN_STARTS):
+            raw = _extract_json_span(cleaned, start)
+            if raw is not None:
+                for attempt_text in _repair_candidates(raw):
+                    try:
+                        return json.dumps(json.loads(attempt_text))
+                    except json.JSONDecodeError:
+                        continue
+            start = cleaned.find(opener, start + 1)
+            if start == -1:
+                break
 
     raise json.JSONDecodeError("No valid JSON found in response", cleaned, 0)
 
 
+parse_ai_json.cache_clear = _parse_repaired.cache_clear
+
+
+def _repair_candidates(text):
+    """text as-is, with LaTeX escapes fixed, and additionally without trailing commas."""
+    fixed = _fix_latex_escapes(text)
+    return text, fixed, _TRAILING_COMMA_RE.sub(r'\1', fixed)
+
+
+def _extract_json_span(text, start):
+    """Return the balanced {...} or [...] value opening at text[start].
+
+    Single left-to-right pass tracking nesting depth; brackets inside
+    string literals (including escaped quotes) are ignored. Returns None
+    if the value never closes.
+    """
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(start, len(text)):
+        c = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif c == '\\':
+                escape = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == '{' or c == '[':
+            depth += 1
+        elif c == '}' or c == ']':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+class JsonCloseTracker:
+    """Incrementally detect when the first JSON object/array in a stream closes.
+
+    Same string/escape-aware depth tracking as _extract_json_span, but fed
+    chunk by chunk so a streamed response is scanned once overall.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.closed = False
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk):
+        """Consume the next chunk of text; return True once the value closed."""
+        if self.closed:
+            return True
+        for c in chunk:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+            elif not self.started:
+                if c == '{' or c == '[':
+                    self.started = True
+                    self.depth = 1
+            elif c == '"':
+                self._in_string = True
+            elif c == '{' or c == '[':
+                self.depth += 1
+            elif c == '}' or c == ']':
+                self.depth -= 1
+                if self.depth == 0:
+                    self.closed = True
+                    return True
+        return False
+
+
 def parse_ai_json_dict(text):
     """Parse JSON from LLM response, guaranteeing a dict return.
 
@@ -108,3 +248,29 @@ def parse_ai_json_dict(text):
     raise ValueError(
         f"LLM returned {type(result).__name__}, expected dict: {text[:300]}"
     )
+
+
+def parse_ai_json_batch(text, count):
+    """Parse a batched LLM response into {index: dict} for items 1..count.
+
+    Expects a JSON array of objects carrying an "index" field (1-based);
+    falls back to array position when the index is missing or invalid.
+    A bare object is treated as a one-element array. Entries outside
+    1..count and non-dict entries are dropped.
+    """
+    data = parse_ai_json(text)
+    if isinstance(data, dict):
+        data = [data]
+    if not isinstance(data, list):
+        return {}
+    by_index = {}
+    for pos, entry in enumerate(data, 1):
+        if not isinstance(entry, dict):
+            continue
+        try:
+            idx = int(entry.get('index', pos))
+        except (TypeError, ValueError):
+            idx = pos
+        if 1 <= idx <= count:
+            by_index.setdefault(idx, entry)
+    return by_index
@@ -2,8 +2,10 @@
 
 Supports: analog clock reading, inequality number line diagrams.
 """
+import functools
 import math
 import random
+import re
 
 # Keywords that trigger clock question generation
 CLOCK_KEYWORDS = {'clock', 'telling time', 'tell time', 'analog time',
@@ -13,11 +15,46 @@ CLOCK_KEYWORDS = {'clock', 'telling time', 'tell time', 'analog time',
 INEQUALITY_KEYWORDS = {'inequality', 'inequalities', 'number line',
                        'number lines', 'graphing inequalities'}
 
+# Substring matchers for the keyword sets above
+_CLOCK_RE = re.compile('|'.join(map(re.escape, sorted(CLOCK_KEYWORDS))))
+_INEQUALITY_RE = re.compile('|'.join(map(re.escape, sorted(INEQUALITY_KEYWORDS))))
 
+# (hour, minute) pairs a clock question can show; same order as the
+# _HOUR_TIMES / _QUARTER_TIMES answer strings below
+_HOUR_CANDIDATES = tuple((h, 0) for h in range(1, 13))
+_QUARTER_CANDIDATES = tuple((h, m) for h in range(1, 13)
+                            for m in (0, 15, 30, 45))
+
+
+_EMPTY_FS = frozenset()
+
+
+def _as_set(recent_questions):
+    """Recent question texts as a set, reusing one the caller already built."""
+    if isinstance(recent_questions, (set, frozenset)):
+        return recent_questions
+    return frozenset(recent_questions) if recent_questions else _EMPTY_FS
+
+
+def _pick_fresh(questions, keys, recent_set):
+    """Pick a question text uniformly, avoiding recent ones if possible.
+
+    questions maps question text -> parameters; keys is tuple(questions).
+    """
+    if recent_set:
+        fresh = questions.keys() - recent_set
+        if fresh:
+            # Sorted so a seeded random gives the same pick regardless of
+            # string hash randomization
+            return random.choice(sorted(fresh))
+    return random.choice(keys)
+
+
+@functools.lru_cache(maxsize=2048)
 def is_clock_node(node_name, node_description=''):
     """Check if a curriculum node is about clock reading."""
     text = (node_name + ' ' + (node_description or '')).lower()
-    return any(kw in text for kw in CLOCK_KEYWORDS)
+    return _CLOCK_RE.search(text) is not None
 
 
 def generate_clock_question(node_name, node_description='', recent_questions=None):
@@ -26,47 +63,24 @@ def generate_clock_question(node_name, node_description='', recent_questions=Non
     Detects hour-only vs quarter-hour from node name/description.
     Returns (question_dict, 'local-clock', description_string).
     """
-    recent_set = set(recent_questions or [])
+    recent_set = _as_set(recent_questions)
     text_lower = (node_name + ' ' + (node_description or '')).lower()
 
     is_hour_only = ('hour' in text_lower and 'half' not in text_lower
                     and 'quarter' not in text_lower)
 
     if is_hour_only:
-        candidates = [(h, 0) for h in range(1, 13)]
+        by_key, keys, pool = _HOUR_QUESTIONS, _HOUR_KEYS, _HOUR_TIMES
     else:
-        candidates = [(h, m) for h in range(1, 13) for m in (0, 15, 30, 45)]
+        by_key, keys, pool = _QUARTER_QUESTIONS, _QUARTER_KEYS, _QUARTER_TIMES
 
-    random.shuffle(candidates)
+    q_key = _pick_fresh(by_key, keys, recent_set)
+    (hour, minute), correct = by_key[q_key]
 
-    question_template = "What time does this clock show?"
-    hour, minute = candidates[0]
-    for h, m in candidates:
-        answer = _format_clock_time(h, m)
-        q_key = f"{question_template} [{answer}]"
-        if q_key not in recent_set:
-            hour, minute = h, m
-            break
-
-    correct = _format_clock_time(hour, minute)
     clock_svg = _generate_clock_svg(hour, minute)
 
-    # Generate plausible wrong choices
-    if is_hour_only:
-        all_hours = list(range(1, 13))
-        all_hours.remove(hour)
-        distractors = random.sample(all_hours, 3)
-        choices = [_format_clock_time(d, 0) for d in distractors] + [correct]
-    else:
-        wrong = set()
-        possible_minutes = [0, 15, 30, 45]
-        while len(wrong) < 3:
-            wh = random.randint(1, 12)
-            wm = random.choice(possible_minutes)
-            t = _format_clock_time(wh, wm)
-            if t != correct:
-                wrong.add(t)
-        choices = list(wrong) + [correct]
+    # Generate plausible wrong choices from the same pool as the answer
+    choices = random.sample([t for t in pool if t != correct], 3) + [correct]
 
     random.shuffle(choices)
 
@@ -83,7 +97,7 @@ def generate_clock_question(node_name, node_description='', recent_questions=Non
         hint = "The long hand on 9 means quarter to the next hour."
 
     q_data = {
-        'question': f"{question_template} [{correct}]",
+        'question': q_key,
         'correct_answer': correct,
         'options': choices,
         'explanation': hint,
@@ -100,85 +114,147 @@ def _format_clock_time(hour, minute):
     return f"{hour}:{minute:02d}"
 
 
-def _generate_clock_svg(hour, minute, size=200):
-    """Generate an analog clock face SVG showing the given time.
-
-    Returns an SVG string with circle, hour numbers, hour/minute hands,
-    center dot.
+# Every time a clock question can show, as formatted answer strings
+_HOUR_TIMES = tuple(_format_clock_time(h, 0) for h in range(1, 13))
+_QUARTER_TIMES = tuple(_format_clock_time(h, m)
+                       for h in range(1, 13) for m in (0, 15, 30, 45))
+
+# Question text (also the recent-question key) -> ((hour, minute), answer)
+_CLOCK_QUESTION = "What time does this clock show?"
+_HOUR_QUESTIONS = {f"{_CLOCK_QUESTION} [{t}]": (hm, t)
+                   for hm, t in zip(_HOUR_CANDIDATES, _HOUR_TIMES)}
+_QUARTER_QUESTIONS = {f"{_CLOCK_QUESTION} [{t}]": (hm, t)
+                      for hm, t in zip(_QUARTER_CANDIDATES, _QUARTER_TIMES)}
+_HOUR_KEYS = tuple(_HOUR_QUESTIONS)
+_QUARTER_KEYS = tuple(_QUARTER_QUESTIONS)
+
+
+# Unit-circle positions of the 12 hour marks, clockwise from 12 o'clock.
+# Index i is hour mark i (index 0 doubles as 12).
+_HOUR_ANGLES = tuple(math.radians(i * 30 - 90) for i in range(12))
+_HOUR_COS = tuple(math.cos(a) for a in _HOUR_ANGLES)
+_HOUR_SIN = tuple(math.sin(a) for a in _HOUR_ANGLES)
+
+_CLOCK_TICK = ('<line x1="{:.1f}" y1="{:.1f}" x2="{:.1f}" '
+               'y2="{:.1f}" stroke="#2C3E50" stroke-width="2"/>')
+_CLOCK_NUMBER = ('<text x="{:.1f}" y="{:.1f}" text-anchor="middle" '
+                 'dominant-baseline="central" font-size="{}" '
+                 'font-family="sans-serif" fill="#2C3E50">{}</text>')
+_CLOCK_CHROME = (
+    '<svg width="{size}" height="{size}" viewBox="0 0 {size} {size}" '
+    'xmlns="http://www.w3.org/2000/svg">\n'
+    '<circle cx="{cx}" cy="{cy}" r="{r}" fill="white" '
+    'stroke="#2C3E50" stroke-width="3"/>\n'
+    '{ticks}\n'
+    '{numbers}\n'
+)
+_MINUTE_HAND = ('<line x1="{cx}" y1="{cy}" x2="{x:.1f}" y2="{y:.1f}" '
+                'stroke="#2C3E50" stroke-width="2.5" stroke-linecap="round"/>\n')
+_HOUR_HAND = ('<line x1="{cx}" y1="{cy}" x2="{x:.1f}" y2="{y:.1f}" '
+              'stroke="#2C3E50" stroke-width="4" stroke-linecap="round"/>\n')
+_CENTER_DOT = '<circle cx="{cx}" cy="{cy}" r="4" fill="#2C3E50"/>\n'
+
+
+@functools.lru_cache(maxsize=8)
+def _clock_chrome(size):
+    """Return the time-independent part of a clock face for *size*.
+
+    SVG opener, rim, 12 tick marks and 12 hour numbers — everything except
+    the hands, so it is rendered once per size.
     """
     cx, cy = size / 2, size / 2
     r = size / 2 - 10
 
-    parts = [
-        f'<svg width="{size}" height="{size}" viewBox="0 0 {size} {size}" '
-        f'xmlns="http://www.w3.org/2000/svg">',
-        f'<circle cx="{cx}" cy="{cy}" r="{r}" fill="white" '
-        f'stroke="#2C3E50" stroke-width="3"/>',
-    ]
-
     # Hour tick marks
-    for i in range(12):
-        angle = math.radians(i * 30 - 90)
-        x1 = cx + (r - 8) * math.cos(angle)
-        y1 = cy + (r - 8) * math.sin(angle)
-        x2 = cx + r * math.cos(angle)
-        y2 = cy + r * math.sin(angle)
-        parts.append(
-            f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" '
-            f'y2="{y2:.1f}" stroke="#2C3E50" stroke-width="2"/>'
-        )
+    tick_in = r - 8
+    ticks = '\n'.join(
+        _CLOCK_TICK.format(cx + tick_in * c, cy + tick_in * s,
+                           cx + r * c, cy + r * s)
+        for c, s in zip(_HOUR_COS, _HOUR_SIN)
+    )
 
     # Hour numbers
-    for i in range(1, 13):
-        angle = math.radians(i * 30 - 90)
-        nx = cx + (r - 22) * math.cos(angle)
-        ny = cy + (r - 22) * math.sin(angle)
-        parts.append(
-            f'<text x="{nx:.1f}" y="{ny:.1f}" text-anchor="middle" '
-            f'dominant-baseline="central" font-size="{size // 10}" '
-            f'font-family="sans-serif" fill="#2C3E50">{i}</text>'
-        )
+    num_r = r - 22
+    font_size = size // 10
+    numbers = '\n'.join(
+        _CLOCK_NUMBER.format(cx + num_r * _HOUR_COS[i % 12],
+                             cy + num_r * _HOUR_SIN[i % 12], font_size, i)
+        for i in range(1, 13)
+    )
+
+    return _CLOCK_CHROME.format_map({
+        'size': size, 'cx': cx, 'cy': cy, 'r': r,
+        'ticks': ticks, 'numbers': numbers,
+    })
+
+
+@functools.lru_cache(maxsize=1024)
+def _dial_unit(position, steps):
+    """(cos, sin) of a hand *position* steps clockwise from 12 on a
+    dial divided into *steps* (60 for minutes, 720 for the hour hand)."""
+    angle = math.radians(position * 360 / steps - 90)
+    return math.cos(angle), math.sin(angle)
+
+
+def _render_hands(hour, minute, size):
+    """Render the minute hand, hour hand and center dot."""
+    cx, cy = size / 2, size / 2
+    r = size / 2 - 10
 
     # Minute hand (long, thin)
-    min_angle = math.radians(minute * 6 - 90)
+    min_cos, min_sin = _dial_unit(minute, 60)
     min_len = r - 30
-    mx = cx + min_len * math.cos(min_angle)
-    my = cy + min_len * math.sin(min_angle)
-    parts.append(
-        f'<line x1="{cx}" y1="{cy}" x2="{mx:.1f}" y2="{my:.1f}" '
-        f'stroke="#2C3E50" stroke-width="2.5" stroke-linecap="round"/>'
-    )
 
-    # Hour hand (short, thick) — accounts for fractional hour from minutes
-    hour_fraction = hour + minute / 60.0
-    hr_angle = math.radians(hour_fraction * 30 - 90)
+    # Hour hand (short, thick) — accounts for fractional hour from minutes,
+    # i.e. one of 720 minute positions on the 12-hour dial
+    hr_cos, hr_sin = _dial_unit((hour % 12) * 60 + minute, 720)
     hr_len = r * 0.55
-    hx = cx + hr_len * math.cos(hr_angle)
-    hy = cy + hr_len * math.sin(hr_angle)
-    parts.append(
-        f'<line x1="{cx}" y1="{cy}" x2="{hx:.1f}" y2="{hy:.1f}" '
-        f'stroke="#2C3E50" stroke-width="4" stroke-linecap="round"/>'
-    )
 
-    # Center dot
-    parts.append(f'<circle cx="{cx}" cy="{cy}" r="4" fill="#2C3E50"/>')
-    parts.append('</svg>')
+    return ''.join((
+        _MINUTE_HAND.format(cx=cx, cy=cy,
+                            x=cx + min_len * min_cos, y=cy + min_len * min_sin),
+        _HOUR_HAND.format(cx=cx, cy=cy,
+                          x=cx + hr_len * hr_cos, y=cy + hr_len * hr_sin),
+        _CENTER_DOT.format(cx=cx, cy=cy),
+    ))
 
-    return '\n'.join(parts)
+
+@functools.lru_cache(maxsize=256)
+def _generate_clock_svg(hour, minute, size=200):
+    """Generate an analog clock face SVG showing the given time.
+
+    Returns an SVG string with circle, hour numbers, hour/minute hands,
+    center dot. Memoized: there are only 48 distinct quiz times per size.
+    """
+    return ''.join((_clock_chrome(size), _render_hands(hour, minute, size), '</svg>'))
 
 
 # ---------------------------------------------------------------------------
 # Inequality number line generator
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=2048)
 def is_inequality_node(node_name, node_description=''):
     """Check if a curriculum node is about inequalities / number lines."""
     text = (node_name + ' ' + (node_description or '')).lower()
-    return any(kw in text for kw in INEQUALITY_KEYWORDS)
+    return _INEQUALITY_RE.search(text) is not None
 
 
 _OPERATORS = ['>', '<', '>=', '<=']
 _OP_LABELS = {'>': '>', '<': '<', '>=': '\u2265', '<=': '\u2264'}
+# Question text (also the recent-question key) -> (operator, boundary)
+_INEQ_QUESTIONS = {
+    f"Which inequality does this number line represent? [x {op} {val}]": (op, val)
+    for op in _OPERATORS for val in range(-5, 6)
+}
+_INEQ_KEYS = tuple(_INEQ_QUESTIONS)
+# op -> (circle type, "is"/"is not" included, shading direction, comparison)
+_OP_EXPLANATION = {
+    '>': ('open', 'is not', 'right', 'greater than'),
+    '<': ('open', 'is not', 'left', 'less than'),
+    '>=': ('filled', 'is', 'right', 'greater than or equal to'),
+    '<=': ('filled', 'is', 'left', 'less than or equal to'),
+}
 
 
 def generate_inequality_question(node_name, node_description='',
@@ -187,18 +263,10 @@ def generate_inequality_question(node_name, node_description='',
 
     Returns (question_dict, 'local-inequality', description_string).
     """
-    recent_set = set(recent_questions or [])
-
-    # Try to find a combination not recently used
-    candidates = [(op, val) for op in _OPERATORS for val in range(-5, 6)]
-    random.shuffle(candidates)
+    recent_set = _as_set(recent_questions)
 
-    op, boundary = candidates[0]
-    for o, v in candidates:
-        q_key = f"Which inequality does this number line represent? [x {o} {v}]"
-        if q_key not in recent_set:
-            op, boundary = o, v
-            break
+    q_key = _pick_fresh(_INEQ_QUESTIONS, _INEQ_KEYS, recent_set)
+    op, boundary = _INEQ_QUESTIONS[q_key]
 
     # Build correct answer and distractors
     correct = f"x {_OP_LABELS[op]} {boundary}"
@@ -212,19 +280,16 @@ def generate_inequality_question(node_name, node_description='',
     svg = _generate_number_line_svg(op, boundary)
 
     # Explanation
-    circle_type = 'filled' if op in ('>=', '<=') else 'open'
-    direction = 'right' if op in ('>', '>=') else 'left'
+    circle_type, included, direction, comparison = _OP_EXPLANATION[op]
     explanation = (
         f"The {circle_type} circle at {boundary} means the value {boundary} "
-        f"{'is' if circle_type == 'filled' else 'is not'} included. "
+        f"{included} included. "
         f"The shading goes to the {direction}, representing all values "
-        f"{'greater than' if direction == 'right' else 'less than'}"
-        f"{' or equal to' if op in ('>=', '<=') else ''} {boundary}."
+        f"{comparison} {boundary}."
     )
 
     q_data = {
-        'question': f"Which inequality does this number line represent? "
-                    f"[x {op} {boundary}]",
+        'question': q_key,
         'correct_answer': correct,
         'options': choices,
         'explanation': explanation,
@@ -236,107 +301,118 @@ def generate_inequality_question(node_name, node_description='',
     return q_data, 'local-inequality', f'Inequality node: {node_name}'
 
 
+_NL_FRAME = (
+    '<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" '
+    'xmlns="http://www.w3.org/2000/svg">\n'
+    # Main line with arrow tips
+    '<line x1="{x_left}" y1="{y}" x2="{x_right}" '
+    'y2="{y}" stroke="#2C3E50" stroke-width="1.5"/>\n'
+    # Left arrow
+    '<polygon points="{x_left},{y} {head_left},{y_up} '
+    '{head_left},{y_down}" fill="#2C3E50"/>\n'
+    # Right arrow
+    '<polygon points="{x_right},{y} '
+    '{head_right},{y_up} '
+    '{head_right},{y_down}" fill="#2C3E50"/>\n'
+    '{ticks}\n'
+    '{region}\n'
+    '{circle}\n'
+    '</svg>'
+)
+_NL_TICK = (
+    '<line x1="{x:.1f}" y1="{y1}" '
+    'x2="{x:.1f}" y2="{y2}" '
+    'stroke="#2C3E50" stroke-width="1.5"/>\n'
+    '<text x="{x:.1f}" y="{label_y}" text-anchor="middle" '
+    'font-size="12" font-family="sans-serif" fill="#2C3E50" '
+    'font-weight="{weight}">{val}</text>'
+)
+_NL_REGION_RIGHT = (
+    '<line x1="{bx:.1f}" y1="{y}" '
+    'x2="{ax:.1f}" y2="{y}" '
+    'stroke="{color}" stroke-width="4" stroke-linecap="round"/>\n'
+    '<polygon points="{ax},{y} {head},{y_up} '
+    '{head},{y_down}" fill="{color}"/>'
+)
+_NL_REGION_LEFT = (
+    '<line x1="{ax:.1f}" y1="{y}" '
+    'x2="{bx:.1f}" y2="{y}" '
+    'stroke="{color}" stroke-width="4" stroke-linecap="round"/>\n'
+    '<polygon points="{ax},{y} {head},{y_up} '
+    '{head},{y_down}" fill="{color}"/>'
+)
+_NL_CIRCLE_FILLED = ('<circle cx="{bx:.1f}" cy="{y}" r="6" '
+                     'fill="{color}" stroke="{color}" stroke-width="2"/>')
+_NL_CIRCLE_OPEN = ('<circle cx="{bx:.1f}" cy="{y}" r="6" '
+                   'fill="white" stroke="{color}" stroke-width="2.5"/>')
+
+
+@functools.lru_cache(maxsize=32)
+def _nl_ticks(low, high, width):
+    """Render the tick marks and labels for the range *low*..*high*.
+
+    Only depends on the visible range, which many boundaries share.
+    """
+    margin = 30
+    line_y = 35
+    label_y = 60
+    spacing = (width - 2 * margin) / (high - low)
+    return '\n'.join(
+        _NL_TICK.format(x=margin + (val - low) * spacing,
+                        y1=line_y - (8 if val == 0 else 5),
+                        y2=line_y + (8 if val == 0 else 5),
+                        label_y=label_y,
+                        weight='bold' if val == 0 else 'normal', val=val)
+        for val in range(low, high + 1)
+    )
+
+
+@functools.lru_cache(maxsize=64)
 def _generate_number_line_svg(operator, boundary, width=420, height=80):
     """Generate a number line SVG for an inequality.
 
     Shows a horizontal line with tick marks, an open/filled circle at the
     boundary, and a colored region + arrow for the solution set.
+    Memoized: there are only 44 distinct quiz inequalities per size.
     """
     # Layout
     margin = 30
     line_y = 35
-    label_y = 60
     usable = width - 2 * margin
 
     # Range: show boundary +/- 4, at least -5 to 5
     low = min(boundary - 4, -5)
     high = max(boundary + 4, 5)
-    n_ticks = high - low + 1
-    spacing = usable / (n_ticks - 1)
+    spacing = usable / (high - low)
 
-    def x_for(val):
-        return margin + (val - low) * spacing
-
-    bx = x_for(boundary)
+    bx = margin + (boundary - low) * spacing
     is_inclusive = operator in ('>=', '<=')
     goes_right = operator in ('>', '>=')
     color = '#3498DB'
 
-    parts = [
-        f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" '
-        f'xmlns="http://www.w3.org/2000/svg">',
-    ]
-
-    # Main line with arrow tips
-    parts.append(
-        f'<line x1="{margin - 15}" y1="{line_y}" x2="{width - margin + 15}" '
-        f'y2="{line_y}" stroke="#2C3E50" stroke-width="1.5"/>'
-    )
-    # Left arrow
-    parts.append(
-        f'<polygon points="{margin - 15},{line_y} {margin - 7},{line_y - 5} '
-        f'{margin - 7},{line_y + 5}" fill="#2C3E50"/>'
-    )
-    # Right arrow
-    parts.append(
-        f'<polygon points="{width - margin + 15},{line_y} '
-        f'{width - margin + 7},{line_y - 5} '
-        f'{width - margin + 7},{line_y + 5}" fill="#2C3E50"/>'
-    )
-
     # Tick marks and labels
-    for val in range(low, high + 1):
-        x = x_for(val)
-        tick_h = 8 if val == 0 else 5
-        parts.append(
-            f'<line x1="{x:.1f}" y1="{line_y - tick_h}" '
-            f'x2="{x:.1f}" y2="{line_y + tick_h}" '
-            f'stroke="#2C3E50" stroke-width="1.5"/>'
-        )
-        font_weight = 'bold' if val == 0 else 'normal'
-        parts.append(
-            f'<text x="{x:.1f}" y="{label_y}" text-anchor="middle" '
-            f'font-size="12" font-family="sans-serif" fill="#2C3E50" '
-            f'font-weight="{font_weight}">{val}</text>'
-        )
+    ticks = _nl_ticks(low, high, width)
 
     # Solution region (thick colored line with arrow)
     if goes_right:
-        parts.append(
-            f'<line x1="{bx:.1f}" y1="{line_y}" '
-            f'x2="{width - margin + 12:.1f}" y2="{line_y}" '
-            f'stroke="{color}" stroke-width="4" stroke-linecap="round"/>'
-        )
-        # Arrow head
         ax = width - margin + 12
-        parts.append(
-            f'<polygon points="{ax},{line_y} {ax - 8},{line_y - 5} '
-            f'{ax - 8},{line_y + 5}" fill="{color}"/>'
-        )
+        region = _NL_REGION_RIGHT.format(bx=bx, ax=ax, head=ax - 8,
+                                         y=line_y, y_up=line_y - 5,
+                                         y_down=line_y + 5, color=color)
     else:
-        parts.append(
-            f'<line x1="{margin - 12:.1f}" y1="{line_y}" '
-            f'x2="{bx:.1f}" y2="{line_y}" '
-            f'stroke="{color}" stroke-width="4" stroke-linecap="round"/>'
-        )
-        # Arrow head
         ax = margin - 12
-        parts.append(
-            f'<polygon points="{ax},{line_y} {ax + 8},{line_y - 5} '
-            f'{ax + 8},{line_y + 5}" fill="{color}"/>'
-        )
+        region = _NL_REGION_LEFT.format(bx=bx, ax=ax, head=ax + 8,
+                                        y=line_y, y_up=line_y - 5,
+                                        y_down=line_y + 5, color=color)
 
     # Boundary circle (open or filled)
-    if is_inclusive:
-        parts.append(
-            f'<circle cx="{bx:.1f}" cy="{line_y}" r="6" '
-            f'fill="{color}" stroke="{color}" stroke-width="2"/>'
-        )
-    else:
-        parts.append(
-            f'<circle cx="{bx:.1f}" cy="{line_y}" r="6" '
-            f'fill="white" stroke="{color}" stroke-width="2.5"/>'
-        )
-
-    parts.append('</svg>')
-    return '\n'.join(parts)
+    circle_tmpl = _NL_CIRCLE_FILLED if is_inclusive else _NL_CIRCLE_OPEN
+    circle = circle_tmpl.format(bx=bx, y=line_y, color=color)
+
+    return _NL_FRAME.format(
+        width=width, height=height, y=line_y,
+        y_up=line_y - 5, y_down=line_y + 5,
+        x_left=margin - 15, head_left=margin - 7,
+        x_right=width - margin + 15, head_right=width - margin + 7,
+        ticks=ticks, region=region, circle=circle,
+    )
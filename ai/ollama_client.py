@@ -1,53 +1,273 @@
 """Ollama HTTP client for local LLM inference."""
+import atexit
+import http.client
 import json
 import logging
+import threading
 import time
-import urllib.request
-import urllib.error
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 
-from config.settings import OLLAMA_BASE_URL, OLLAMA_MODEL
+from ai import prompt_cache
+from ai.json_utils import JsonCloseTracker, fast_dumps, fast_loads, parse_ai_json
+from config.settings import (
+    OLLAMA_BASE_URL, OLLAMA_KEEP_ALIVE, OLLAMA_MODEL, OLLAMA_NUM_CTX,
+    OLLAMA_NUM_PARALLEL, PROMPT_CACHE_MAX_TEMPERATURE,
+)
 
 logger = logging.getLogger(__name__)
 
+_URL = urllib.parse.urlsplit(OLLAMA_BASE_URL)
+_CHAT_PATH = _URL.path.rstrip('/') + '/api/chat'
+_TIMEOUT = 120
 
-def ask(system_prompt, user_prompt, max_tokens=512, temperature=0.7):
-    """Send a chat completion request to Ollama.
+# Idle keep-alive connections shared by every thread. A request checks one
+# out (http.client connections aren't thread-safe) and returns it once the
+# response is fully read; at most OLLAMA_NUM_PARALLEL are kept idle, the
+# rest are closed.
+_idle = []
+_idle_lock = threading.Lock()
 
-    Returns (response_text, model_used, full_prompt).
+# A reused keep-alive socket the server already closed fails like this;
+# the request never reached Ollama, so it is safe to resend once.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected,
+                            ConnectionResetError, BrokenPipeError)
+
+
+def _checkout():
+    """Return (an idle or new connection, whether it was already open)."""
+    with _idle_lock:
+        if _idle:
+            return _idle.pop(), True
+    if _URL.scheme == 'https':
+        conn = http.client.HTTPSConnection(_URL.hostname, _URL.port, timeout=_TIMEOUT)
+    else:
+        conn = http.client.HTTPConnection(_URL.hostname, _URL.port, timeout=_TIMEOUT)
+    return conn, False
+
+
+def _checkin(conn):
+    """Return a connection whose response was read to the end to the pool."""
+    with _idle_lock:
+        if len(_idle) < OLLAMA_NUM_PARALLEL:
+            _idle.append(conn)
+            return
+    conn.close()
+
+
+@atexit.register
+def close_connections():
+    """Close every idle keep-alive connection in the pool."""
+    with _idle_lock:
+        conns = list(_idle)
+        _idle.clear()
+    for conn in conns:
+        conn.close()
+
+
+def _chat_payload(system_prompt, user_prompt, max_tokens, temperature, stream=False,
+                  model=None):
+    """Build the JSON body for one /api/chat call.
+
+    The system prompt goes first so consecutive calls share a prompt prefix,
+    which Ollama serves from the KV cache while the model stays loaded.
     """
-    full_prompt = f"SYSTEM: {system_prompt}\n\nUSER: {user_prompt}"
-    data = json.dumps({
-        'model': OLLAMA_MODEL,
+    return {
+        'model': model or OLLAMA_MODEL,
         'messages': [
             {'role': 'system', 'content': system_prompt},
             {'role': 'user', 'content': user_prompt},
         ],
-        'stream': False,
+        'stream': stream,
         'think': False,
-        'keep_alive': '30m',
+        'keep_alive': OLLAMA_KEEP_ALIVE,
         'options': {
+            'num_ctx': OLLAMA_NUM_CTX,
             'num_predict': max_tokens,
             'temperature': temperature,
         },
-    }).encode()
+    }
+
+
+def _open_chat(payload):
+    """POST to /api/chat on a pooled keep-alive connection.
+
+    Returns (http.client response, connection). Read the response to the end
+    and _checkin the connection, or close both, when done with it.
+    Raises ConnectionError if Ollama can't be reached or returns an error.
+    """
+    body = fast_dumps(payload)
+    while True:
+        conn, reused = _checkout()
+        try:
+            conn.request('POST', _CHAT_PATH, body=body,
+                         headers={'Content-Type': 'application/json'})
+            resp = conn.getresponse()
+        except _STALE_CONNECTION_ERRORS as e:
+            conn.close()
+            if reused:
+                continue
+            logger.error('Ollama request failed: %s', e)
+            raise ConnectionError(f"Cannot reach Ollama at {OLLAMA_BASE_URL}: {e}") from e
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            logger.error('Ollama request failed: %s', e)
+            raise ConnectionError(f"Cannot reach Ollama at {OLLAMA_BASE_URL}: {e}") from e
+        if resp.status >= 400:
+            detail = resp.read()[:300].decode(errors='replace')
+            _checkin(conn)
+            logger.error('Ollama returned HTTP %d: %s', resp.status, detail)
+            raise ConnectionError(f"Ollama at {OLLAMA_BASE_URL} returned HTTP {resp.status}: {detail}")
+        return resp, conn
+
+
+def ask(system_prompt, user_prompt, max_tokens=512, temperature=0.7, model=None):
+    """Send a chat completion request to Ollama and return the whole reply.
+
+    Reads the streaming endpoint to the end, so a stalled generation
+    surfaces as a read timeout between chunks rather than one long wait.
+    model defaults to OLLAMA_MODEL. Returns (response_text, model_used,
+    full_prompt). Low-temperature requests are served from the on-disk
+    prompt cache when possible.
+    """
+    model = model or OLLAMA_MODEL
+    full_prompt = f"SYSTEM: {system_prompt}\n\nUSER: {user_prompt}"
+    cache_key = None
+    if temperature <= PROMPT_CACHE_MAX_TEMPERATURE:
+        cache_key = prompt_cache.make_key(model, system_prompt, user_prompt,
+                                          temperature, max_tokens)
+        cached = prompt_cache.get(cache_key)
+        if cached is not None:
+            logger.info('Ollama cache hit — %d chars', len(cached[0]))
+            return cached[0], cached[1], full_prompt
+
+    t0 = time.monotonic()
+    parts = []
+    eval_count = 0
+    for chunk in _stream_chunks(system_prompt, user_prompt, max_tokens, temperature,
+                                model=model):
+        model = chunk.get('model', model)
+        content = chunk.get('message', {}).get('content', '')
+        if content:
+            parts.append(content)
+        if chunk.get('done'):
+            eval_count = chunk.get('eval_count', 0)
+    elapsed = time.monotonic() - t0
+    text = ''.join(parts)
+    logger.info('Ollama %s — %d chars, %d tokens, %.1fs',
+                 model, len(text), eval_count, elapsed)
+    if cache_key is not None and text:
+        prompt_cache.put(cache_key, text, model)
+    return text, model, full_prompt
 
-    req = urllib.request.Request(
-        f"{OLLAMA_BASE_URL}/api/chat",
-        data=data,
-        headers={'Content-Type': 'application/json'},
-    )
 
+def _stream_chunks(system_prompt, user_prompt, max_tokens, temperature, model=None):
+    """Yield the parsed NDJSON chunks of a streaming /api/chat call.
+
+    Closing the generator early closes the connection, which makes Ollama
+    stop generating. A stream read to its final chunk returns the connection
+    to the pool.
+    """
+    resp, conn = _open_chat(_chat_payload(system_prompt, user_prompt, max_tokens,
+                                          temperature, stream=True, model=model))
+    finished = False
     try:
-        t0 = time.monotonic()
-        resp = urllib.request.urlopen(req, timeout=120)
-        result = json.loads(resp.read())
-        elapsed = time.monotonic() - t0
-        text = result.get('message', {}).get('content', '')
-        model = result.get('model', OLLAMA_MODEL)
-        eval_count = result.get('eval_count', 0)
-        logger.info('Ollama %s — %d chars, %d tokens, %.1fs',
-                     model, len(text), eval_count, elapsed)
-        return text, model, full_prompt
-    except urllib.error.URLError as e:
-        logger.error('Ollama request failed: %s', e)
-        raise ConnectionError(f"Cannot reach Ollama at {OLLAMA_BASE_URL}: {e}") from e
+        for line in resp:
+            if not line.strip():
+                continue
+            chunk = fast_loads(line)
+            yield chunk
+            if chunk.get('done'):
+                resp.read()  # consume the chunked terminator
+                finished = True
+                break
+    except (OSError, http.client.HTTPException) as e:
+        logger.error('Ollama stream failed: %s', e)
+        raise ConnectionError(f"Lost connection to Ollama at {OLLAMA_BASE_URL}: {e}") from e
+    finally:
+        if finished:
+            _checkin(conn)
+        else:
+            resp.close()
+            conn.close()
+
+
+def ask_stream(system_prompt, user_prompt, max_tokens=512, temperature=0.7,
+               model=None):
+    """Yield response text fragments as Ollama generates them.
+
+    model defaults to OLLAMA_MODEL.
+    """
+    for chunk in _stream_chunks(system_prompt, user_prompt, max_tokens, temperature,
+                                model=model):
+        content = chunk.get('message', {}).get('content', '')
+        if content:
+            yield content
+
+
+def ask_until_json_closes(system_prompt, user_prompt, max_tokens=512, temperature=0.7,
+                          model=None):
+    """Stream a response and stop as soon as its JSON value is complete.
+
+    Any prose the model would add after the closing brace is never
+    generated. If the text at that point doesn't parse (e.g. a stray bracket
+    in leading prose closed first), streaming continues to the end.
+
+    model defaults to OLLAMA_MODEL. Returns (response_text, model_used,
+    full_prompt), like ask().
+    """
+    model = model or OLLAMA_MODEL
+    full_prompt = f"SYSTEM: {system_prompt}\n\nUSER: {user_prompt}"
+    tracker = JsonCloseTracker()
+    parts = []
+    early = False
+    t0 = time.monotonic()
+    stream = _stream_chunks(system_prompt, user_prompt, max_tokens, temperature,
+                            model=model)
+    try:
+        for chunk in stream:
+            model = chunk.get('model', model)
+            content = chunk.get('message', {}).get('content', '')
+            if not content:
+                continue
+            parts.append(content)
+            if not tracker.closed and tracker.feed(content):
+                try:
+                    parse_ai_json(''.join(parts))
+                except json.JSONDecodeError:
+                    continue
+                early = True
+                break
+    finally:
+        stream.close()
+    text = ''.join(parts)
+    logger.info('Ollama %s — %d chars, %.1fs%s', model, len(text),
+                time.monotonic() - t0, ' (stopped at JSON close)' if early else '')
+    return text, model, full_prompt
+
+
+def ask_many(system_prompt, user_prompts, max_tokens=512, temperature=0.7,
+             model=None):
+    """Send several independent chat requests to Ollama concurrently.
+
+    Requests overlap on the wire and fill Ollama's parallel slots, so N
+    prompts finish in roughly the time of the slowest one instead of the sum.
+    Concurrency is capped at OLLAMA_NUM_PARALLEL — keep it equal to the
+    server's own OLLAMA_NUM_PARALLEL setting. model defaults to OLLAMA_MODEL.
+
+    Returns a list of (response_text, model_used, full_prompt), one per
+    user prompt, in input order.
+    """
+    user_prompts = list(user_prompts)
+    if len(user_prompts) <= 1:
+        return [ask(system_prompt, u, max_tokens=max_tokens,
+                    temperature=temperature, model=model) for u in user_prompts]
+
+    workers = max(1, min(OLLAMA_NUM_PARALLEL, len(user_prompts)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(ask, system_prompt, u, max_tokens=max_tokens,
+                        temperature=temperature, model=model)
+            for u in user_prompts
+        ]
+        return [f.result() for f in futures]
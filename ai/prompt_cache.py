@@ -0,0 +1,91 @@
+"""On-disk cache of Ollama responses for repeated low-temperature prompts.
+
+Keyed on a hash of (model, system prompt, user prompt, temperature,
+max_tokens). Used by ask() only when the temperature is low enough that a
+repeat call would return essentially the same text anyway.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+
+from config.settings import PROMPT_CACHE_PATH, PROMPT_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prompt_cache (
+    key TEXT PRIMARY KEY,
+    response_text TEXT NOT NULL,
+    model TEXT NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+
+
+def _connect():
+    conn = sqlite3.connect(PROMPT_CACHE_PATH, timeout=5)
+    conn.execute(_SCHEMA)
+    return conn
+
+
+def make_key(model, system_prompt, user_prompt, temperature, max_tokens):
+    """Stable cache key for one chat request."""
+    raw = json.dumps([model, system_prompt, user_prompt, temperature, max_tokens])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def get(key):
+    """Return (response_text, model) for a fresh entry, or None."""
+    try:
+        conn = _connect()
+        try:
+            row = conn.execute(
+                "SELECT response_text, model, created_at FROM prompt_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning('Prompt cache read failed: %s', e)
+        return None
+    if row is None:
+        return None
+    if PROMPT_CACHE_TTL and time.time() - row[2] > PROMPT_CACHE_TTL:
+        return None
+    return row[0], row[1]
+
+
+def put(key, response_text, model):
+    """Store a response. Cache failures are logged, never raised."""
+    try:
+        conn = _connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO prompt_cache (key, response_text, model, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, response_text, model, time.time()),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning('Prompt cache write failed: %s', e)
+
+
+def clear(expired_only=False):
+    """Delete cached responses (only stale ones if expired_only). Returns count."""
+    conn = _connect()
+    try:
+        if expired_only:
+            if not PROMPT_CACHE_TTL:
+                return 0
+            cur = conn.execute("DELETE FROM prompt_cache WHERE created_at < ?",
+                               (time.time() - PROMPT_CACHE_TTL,))
+        else:
+            cur = conn.execute("DELETE FROM prompt_cache")
+        conn.commit()
+        return cur.rowcount
+    finally:
+        conn.close()
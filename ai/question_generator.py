@@ -1,8 +1,17 @@
 """Generate adaptive questions via Ollama at a specified difficulty."""
+import functools
 import logging
-
-from ai.ollama_client import ask
-from ai.json_utils import parse_ai_json_dict
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from ai.ollama_client import ask_until_json_closes
+from ai.json_utils import JsonCloseTracker, parse_ai_json_dict
+from config.settings import (
+    QUESTION_CACHE_BUCKET, QUESTION_CACHE_SIZE, QUESTION_CACHE_TTL,
+    QUESTION_MAX_TOKENS, QUESTION_RETRY_MAX_TOKENS,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -16,36 +25,24 @@ SUBJECT_KEYWORDS = {
 }
 
 
+# One compiled alternation per subject, in priority order (dict order above)
+_SUBJECT_RES = tuple(
+    (subject, re.compile('|'.join(map(re.escape, keywords))))
+    for subject, keywords in SUBJECT_KEYWORDS.items()
+)
+
+
+@functools.lru_cache(maxsize=4096)
 def get_subject_prompt(topic_name, node_name):
-    """Select the appropriate system prompt based on topic."""
-    topic_lower = topic_name.lower()
-    node_lower = node_name.lower()
-    combined = f"{topic_lower} {node_lower}"
-
-    # Check for Hebrew
-    for keyword in SUBJECT_KEYWORDS['hebrew']:
-        if keyword in combined:
-            return HEBREW_PROMPT
-
-    # Check for Math
-    for keyword in SUBJECT_KEYWORDS['math']:
-        if keyword in combined:
-            return MATH_PROMPT
-
-    # Check for Reading
-    for keyword in SUBJECT_KEYWORDS['reading']:
-        if keyword in combined:
-            return READING_PROMPT
-
-    # Check for Science
-    for keyword in SUBJECT_KEYWORDS['science']:
-        if keyword in combined:
-            return SCIENCE_PROMPT
-
-    # Check for Social Studies
-    for keyword in SUBJECT_KEYWORDS['social_studies']:
-        if keyword in combined:
-            return SOCIAL_STUDIES_PROMPT
+    """Select the appropriate system prompt based on topic.
+
+    Subjects are checked in priority order (Hebrew first), so a match for
+    an earlier subject anywhere in the text wins over a later one.
+    """
+    combined = (topic_name + ' ' + node_name).lower()
+    for subject, pattern in _SUBJECT_RES:
+        if pattern.search(combined):
+            return _SUBJECT_PROMPTS[subject]
 
     # Default to generic prompt
     return DEFAULT_PROMPT
@@ -228,39 +225,161 @@ Rules:
 8. Keep answers concise — under 200 characters.
 9. Use LaTeX notation for math: \\(\\sqrt{16}\\), \\(\\frac{1}{2}\\), \\(x^2\\)."""
 
+_SUBJECT_PROMPTS = {
+    'hebrew': HEBREW_PROMPT,
+    'math': MATH_PROMPT,
+    'reading': READING_PROMPT,
+    'science': SCIENCE_PROMPT,
+    'social_studies': SOCIAL_STUDIES_PROMPT,
+}
 
 
-def generate(node_name, node_description, topic_name, skill_description,
-             target_difficulty_elo, question_type, recent_questions=None):
-    """Generate a question via Ollama.
+def _is_truncated_json(text):
+    """True if the response opens a JSON value that never closes."""
+    tracker = JsonCloseTracker()
+    tracker.feed(text)
+    return tracker.started and not tracker.closed
 
-    Returns (question_dict, model_used, prompt_used).
-    """
-    # Map ELO difficulty to 0-1 scale for the prompt
-    # ELO 400 = 0.0 (easiest), ELO 1200 = 1.0 (hardest)
-    # Formula: (target - 400) / 800
-    # At skill 800: target=559 → norm=0.20; at skill 1000: target=759 → norm=0.45
-    norm_difficulty = max(0.0, min(1.0, (target_difficulty_elo - 400) / 800))
 
-    recent_str = "\n".join(f"- {q}" for q in (recent_questions or [])[:20]) or "None"
-
-    # Get subject-specific prompt
-    system_prompt = get_subject_prompt(topic_name, node_name)
+@functools.lru_cache(maxsize=512)
+def _prompt_prefix(question_type, topic_name, node_name, node_description):
+    """User-prompt header up to the difficulty line.
 
-    user_prompt = f"""Generate a {question_type} question for:
+    Depends only on the node and question type, so it is identical across
+    consecutive questions on a node (one cache entry per node, and a stable
+    prompt prefix for Ollama's KV cache); difficulty and the recent-question
+    list follow it.
+    """
+    return f"""Generate a {question_type} question for:
 - Topic: {topic_name}
 - Concept: {node_name}
 - Concept description: {node_description}
-- Difficulty: {norm_difficulty:.2f} (0.0=easiest, 1.0=hardest)
+"""
+
+
+_PROMPT_DIFFICULTY = """- Difficulty: {:.2f} (0.0=easiest, 1.0=hardest)
 - Recent questions (DO NOT repeat these or ask similar ones):
-{recent_str}
+"""
+_PROMPT_TAIL = """
 
 IMPORTANT: Do NOT include "options" in your response. Only provide question, correct_answer, and explanation.
 The system will generate multiple choice options automatically.
 
 Return JSON only."""
 
-    text, model, prompt = ask(system_prompt, user_prompt)
+
+# (topic, node, description, question_type, difficulty bucket)
+#   -> (created_at, q_data, model, prompt), least recently used first
+_question_cache = OrderedDict()
+_question_cache_lock = threading.Lock()
+
+
+def _cached_question(key, recent_questions):
+    """Return a copy of a fresh cached (q_data, model, prompt) for *key*.
+
+    Skips entries whose question text is in *recent_questions*, so a cached
+    question is never shown twice to the same student.
+    """
+    if QUESTION_CACHE_TTL <= 0:
+        return None
+    with _question_cache_lock:
+        entry = _question_cache.get(key)
+        if entry is None:
+            return None
+        created_at, q_data, model, prompt = entry
+        if time.time() - created_at > QUESTION_CACHE_TTL:
+            del _question_cache[key]
+            return None
+        _question_cache.move_to_end(key)
+    if q_data.get('question', '').strip() in set(recent_questions or ()):
+        return None
+    return dict(q_data), model, prompt
+
+
+def _norm_difficulty(target_difficulty_elo):
+    # Map ELO difficulty to 0-1 scale for the prompt
+    # ELO 400 = 0.0 (easiest), ELO 1200 = 1.0 (hardest)
+    # Formula: (target - 400) / 800
+    # At skill 800: target=559 → norm=0.20; at skill 1000: target=759 → norm=0.45
+    return max(0.0, min(1.0, (target_difficulty_elo - 400) / 800))
+
+
+def _cache_key(node_name, node_description, topic_name, target_difficulty_elo,
+               question_type):
+    return (topic_name, node_name, node_description, question_type,
+            round(_norm_difficulty(target_difficulty_elo) / QUESTION_CACHE_BUCKET))
+
+
+def cache_question(node_name, node_description, topic_name, target_difficulty_elo,
+                   question_type, q_data, model, prompt):
+    """Offer a generated question for reuse by later generate() calls.
+
+    Call only once the question has passed validation and dedup, so a
+    rejected question is never served again. Re-caching the question that
+    is already cached leaves its age unchanged.
+    """
+    if QUESTION_CACHE_TTL <= 0 or not isinstance(q_data, dict):
+        return
+    key = _cache_key(node_name, node_description, topic_name,
+                     target_difficulty_elo, question_type)
+    with _question_cache_lock:
+        entry = _question_cache.get(key)
+        if entry is not None and entry[1].get('question') == q_data.get('question'):
+            return
+        _question_cache[key] = (time.time(), dict(q_data), model, prompt)
+        _question_cache.move_to_end(key)
+        while len(_question_cache) > QUESTION_CACHE_SIZE:
+            _question_cache.popitem(last=False)
+
+
+def clear_question_cache():
+    with _question_cache_lock:
+        _question_cache.clear()
+
+
+def generate(node_name, node_description, topic_name, skill_description,
+             target_difficulty_elo, question_type, recent_questions=None,
+             use_cache=True):
+    """Generate a question via Ollama.
+
+    A question stored with cache_question() within QUESTION_CACHE_TTL for
+    the same node, type and difficulty bucket is reused unless it is in
+    recent_questions; pass use_cache=False to force a fresh one (e.g. after
+    a rejection). Fresh questions are not cached here — the caller caches
+    them once they pass validation.
+
+    Returns (question_dict, model_used, prompt_used).
+    """
+    norm_difficulty = _norm_difficulty(target_difficulty_elo)
+
+    if use_cache:
+        cache_key = _cache_key(node_name, node_description, topic_name,
+                               target_difficulty_elo, question_type)
+        cached = _cached_question(cache_key, recent_questions)
+        if cached is not None:
+            logger.info('Reusing cached %s question for "%s" at difficulty %.2f',
+                        question_type, node_name, norm_difficulty)
+            return cached
+
+    recent_str = "\n".join(f"- {q}" for q in (recent_questions or [])[:20]) or "None"
+
+    # Get subject-specific prompt
+    system_prompt = get_subject_prompt(topic_name, node_name)
+
+    user_prompt = ''.join((
+        _prompt_prefix(question_type, topic_name, node_name, node_description),
+        _PROMPT_DIFFICULTY.format(norm_difficulty), recent_str, _PROMPT_TAIL,
+    ))
+
+    # Streamed, and cut off as soon as the JSON object closes: whatever the
+    # model would say after it is never generated.
+    text, model, prompt = ask_until_json_closes(system_prompt, user_prompt,
+                                                max_tokens=QUESTION_MAX_TOKENS)
+    if _is_truncated_json(text):
+        logger.warning('Question for "%s" was cut off at %d tokens, retrying with %d',
+                       node_name, QUESTION_MAX_TOKENS, QUESTION_RETRY_MAX_TOKENS)
+        text, model, prompt = ask_until_json_closes(
+            system_prompt, user_prompt, max_tokens=QUESTION_RETRY_MAX_TOKENS)
     logger.info('Raw LLM response for "%s": %s', node_name, text[:500])
     q_data = parse_ai_json_dict(text)
 
@@ -1,35 +1,51 @@
 """Mora — Flask application entry point."""
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 import re
 import traceback
 import argparse
 
 from flask import Flask, request as flask_request
 
-from db.database import init_db
+from db.database import close_db, init_db
 from routes.home import home_bp
 from routes.session import session_bp
 from routes.dashboard import dashboard_bp
 from routes.admin import admin_bp
 
+# MCQ option prefix like 'A) ' or 'b. ', stripped by the strip_letter filter
+_LETTER_PREFIX_RE = re.compile(r'^[A-Da-d][).\s]+\s*')
+
 # --- File logging with daily rotation, 3-day retention ---
 LOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mora_debug.log')
 
+log_formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(name)s: %(message)s')
+
 file_handler = logging.handlers.TimedRotatingFileHandler(
     LOG_FILE, when='midnight', backupCount=3, encoding='utf-8',
 )
 file_handler.setLevel(logging.DEBUG)
-file_handler.setFormatter(logging.Formatter(
-    '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
-))
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
-    handlers=[logging.StreamHandler(), file_handler],
+file_handler.setFormatter(log_formatter)
+
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(log_formatter)
+
+# Request threads only enqueue records; a background listener does the
+# console and disk writes.
+log_queue = queue.SimpleQueue()
+queue_handler = logging.handlers.QueueHandler(log_queue)
+# Records are formatted once, by the listener's handlers
+queue_handler.setFormatter(logging.Formatter('%(message)s'))
+log_listener = logging.handlers.QueueListener(
+    log_queue, stream_handler, file_handler, respect_handler_level=True,
 )
+log_listener.start()
+atexit.register(log_listener.stop)
+
+logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
 
 
 def create_app():
@@ -44,7 +60,7 @@ def create_app():
     @app.template_filter('strip_letter')
     def strip_letter_prefix(text):
         """Remove leading letter prefix like 'A) ' or 'B. ' from MCQ options."""
-        return re.sub(r'^[A-Da-d][).\s]+\s*', '', str(text))
+        return _LETTER_PREFIX_RE.sub('', str(text))
 
     from markupsafe import Markup
     from services.math_renderer import render_math_in_text
@@ -57,14 +73,24 @@ def create_app():
     # --- Request/response logging ---
     req_logger = logging.getLogger('mora.requests')
 
+    def _should_log():
+        """Skip static files and the favicon, and all work when INFO is off."""
+        path = flask_request.path
+        return (req_logger.isEnabledFor(logging.INFO)
+                and not path.startswith('/static/') and not path.endswith('.ico'))
+
     @app.before_request
     def log_request():
-        form_data = dict(flask_request.form) if flask_request.form else {}
+        if not _should_log():
+            return
+        form_data = flask_request.form.to_dict() if flask_request.form else {}
         req_logger.info('>>> %s %s  form=%s', flask_request.method,
                         flask_request.full_path.rstrip('?'), form_data)
 
     @app.after_request
     def log_response(response):
+        if not _should_log():
+            return response
         req_logger.info('<<< %s %s  status=%d  location=%s',
                         flask_request.method,
                         flask_request.full_path.rstrip('?'),
@@ -92,6 +118,9 @@ def create_app():
                          traceback.format_exc())
         return "Internal Server Error", 500
 
+    # Request threads share one SQLite connection per thread; release it
+    app.teardown_appcontext(close_db)
+
     with app.app_context():
         init_db()
 
@@ -10,6 +10,37 @@ DB_PATH = os.path.join(BASE_DIR, 'mora.db')
 # Ollama
 OLLAMA_BASE_URL = os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434')
 OLLAMA_MODEL = os.environ.get('OLLAMA_MODEL', 'qwen2.5')
+# Max concurrent requests for bulk calls (ask_many, batch_runner). Match the Ollama server's
+# OLLAMA_NUM_PARALLEL; set OLLAMA_MAX_LOADED_MODELS=1 on the server so parallel
+# slots share one resident model instead of loading copies.
+OLLAMA_NUM_PARALLEL = int(os.environ.get('OLLAMA_NUM_PARALLEL', '4'))
+# How long Ollama keeps the model (and the KV cache of the last prompt prefix,
+# i.e. the shared system prompt) resident after a request.
+OLLAMA_KEEP_ALIVE = os.environ.get('OLLAMA_KEEP_ALIVE', '1h')
+# Context window per request. Must cover the system prompt, the recent-question
+# list and QUESTION_RETRY_MAX_TOKENS of output; keep it the same for every call,
+# since a different num_ctx makes Ollama reload the model.
+OLLAMA_NUM_CTX = int(os.environ.get('OLLAMA_NUM_CTX', '4096'))
+# Answers packed into one prompt by grade_batch/explain_batch. Bounded so a
+# long quiz stays inside the model's context window.
+GRADE_BATCH_SIZE = int(os.environ.get('GRADE_BATCH_SIZE', '8'))
+# Token budget for one generated question; a response cut off mid-JSON is
+# retried once with the larger budget.
+QUESTION_MAX_TOKENS = 512
+QUESTION_RETRY_MAX_TOKENS = 2048
+# In-memory reuse of generated questions for the same node, question type and
+# difficulty bucket (QUESTION_CACHE_BUCKET wide on the 0-1 scale). Entries
+# expire after QUESTION_CACHE_TTL seconds (0 disables the cache).
+QUESTION_CACHE_TTL = int(os.environ.get('QUESTION_CACHE_TTL', '3600'))
+QUESTION_CACHE_SIZE = int(os.environ.get('QUESTION_CACHE_SIZE', '256'))
+QUESTION_CACHE_BUCKET = 0.05
+# On-disk cache of Ollama responses. Only requests at or below
+# PROMPT_CACHE_MAX_TEMPERATURE are cached (set it negative to disable);
+# entries expire after PROMPT_CACHE_TTL seconds (0 = never).
+PROMPT_CACHE_PATH = os.environ.get('PROMPT_CACHE_PATH',
+                                   os.path.join(BASE_DIR, 'prompt_cache.db'))
+PROMPT_CACHE_TTL = int(os.environ.get('PROMPT_CACHE_TTL', str(7 * 24 * 3600)))
+PROMPT_CACHE_MAX_TEMPERATURE = float(os.environ.get('PROMPT_CACHE_MAX_TEMPERATURE', '0.3'))
 
 # ELO defaults
 ELO_DEFAULTS = {
@@ -2,6 +2,8 @@
 import logging
 import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 
 from config.settings import DB_PATH
 
@@ -9,17 +11,58 @@ log = logging.getLogger(__name__)
 SCHEMA_PATH = os.path.join(os.path.dirname(__file__), 'schema.sql')
 
 
+def _load_schema():
+    """Split schema.sql into (CREATE TABLE script, everything-else script)."""
+    with open(SCHEMA_PATH, 'r') as f:
+        statements = [stmt.strip() for stmt in f.read().split(';')]
+    statements = [stmt for stmt in statements if stmt]
+    tables = [s for s in statements if s.upper().startswith('CREATE TABLE')]
+    others = [s for s in statements if not s.upper().startswith('CREATE TABLE')]
+    return ''.join(s + ';\n' for s in tables), ''.join(s + ';\n' for s in others)
+
+
+# Read once at import; init_db runs per app start and per test
+_CREATE_TABLES_SQL, _OTHER_SQL = _load_schema()
+
+
+# Per-thread connection reused by query_db/execute_db; see _thread_db().
+_local = threading.local()
+
+
 def get_db():
+    """Open a new configured connection. The caller closes it."""
     conn = sqlite3.connect(DB_PATH, timeout=5)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys=ON")
     conn.execute("PRAGMA journal_mode=WAL")
+    # WAL keeps the database consistent at NORMAL; only the last commits
+    # before a power loss can be lost, and no fsync is paid per commit.
+    conn.execute("PRAGMA synchronous=NORMAL")
     return conn
 
 
-def _column_exists(conn, table, column):
-    cur = conn.execute(f"PRAGMA table_info({table})")
-    return any(row[1] == column for row in cur.fetchall())
+def _thread_db():
+    """Return this thread's shared connection, opening it on first use.
+
+    Reopened if DB_PATH has changed since (tests point it at a temp file).
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is None or _local.path != DB_PATH:
+        close_db()
+        conn = get_db()
+        _local.conn, _local.path = conn, DB_PATH
+    return conn
+
+
+def close_db(exc=None):
+    """Close this thread's shared connection, if open.
+
+    Registered as a Flask teardown so request threads don't hold it open.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        _local.conn = None
+        conn.close()
 
 
 def _migrate(conn):
@@ -33,8 +76,13 @@ def _migrate(conn):
         ('questions', 'test_status', "TEXT DEFAULT 'approved' CHECK(test_status IN ('pending_review', 'approved', 'rejected'))"),
         ('questions', 'validation_error', 'TEXT'),
     ]
+    # One PRAGMA table_info per table, not per column
+    existing = {
+        table: {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for table in {t for t, _, _ in migrations}
+    }
     for table, column, col_type in migrations:
-        if not _column_exists(conn, table, column):
+        if column not in existing[table]:
             conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
             log.info("Migration: added %s.%s", table, column)
     conn.commit()
@@ -43,34 +91,19 @@ def _migrate(conn):
 def init_db():
     conn = get_db()
     try:
-        # Read schema and split into statements
-        with open(SCHEMA_PATH, 'r') as f:
-            schema = f.read()
         # Run migrations before indexes (existing DBs need new columns first)
-        # Execute CREATE TABLE statements first
-        for stmt in schema.split(';'):
-            stmt = stmt.strip()
-            if not stmt:
-                continue
-            if stmt.upper().startswith('CREATE TABLE'):
-                conn.execute(stmt)
-        conn.commit()
+        # Execute CREATE TABLE statements first (executescript commits)
+        conn.executescript(_CREATE_TABLES_SQL)
         _migrate(conn)
         # Now execute remaining statements (CREATE INDEX, etc.)
-        for stmt in schema.split(';'):
-            stmt = stmt.strip()
-            if not stmt:
-                continue
-            if not stmt.upper().startswith('CREATE TABLE'):
-                conn.execute(stmt)
-        conn.commit()
+        conn.executescript(_OTHER_SQL)
         log.info("Database initialized at %s", DB_PATH)
     finally:
         conn.close()
 
 
 def query_db(sql, params=(), one=False):
-    conn = get_db()
+    conn = _thread_db()
     try:
         cur = conn.execute(sql, params)
         rows = [dict(row) for row in cur.fetchall()]
@@ -78,18 +111,55 @@ def query_db(sql, params=(), one=False):
     except sqlite3.Error as e:
         log.error("query_db error: %s | SQL: %s", e, sql[:200])
         raise
+
+
+def _in_transaction():
+    return getattr(_local, 'depth', 0) > 0
+
+
+@contextmanager
+def transaction():
+    """Group writes on this thread's connection into a single commit.
+
+    execute_db/execute_many calls inside the block don't commit on their
+    own; everything is committed when the outermost block exits, or rolled
+    back if it raises.
+    """
+    conn = _thread_db()
+    outermost = not _in_transaction()
+    _local.depth = getattr(_local, 'depth', 0) + 1
+    try:
+        yield conn
+    except BaseException:
+        if outermost:
+            conn.rollback()
+        raise
+    else:
+        if outermost:
+            conn.commit()
     finally:
-        conn.close()
+        _local.depth -= 1
 
 
 def execute_db(sql, params=()):
-    conn = get_db()
+    conn = _thread_db()
     try:
         cur = conn.execute(sql, params)
-        conn.commit()
+        if not _in_transaction():
+            conn.commit()
         return cur.lastrowid
     except sqlite3.Error as e:
+        if not _in_transaction():
+            conn.rollback()
         log.error("execute_db error: %s | SQL: %s", e, sql[:200])
         raise
-    finally:
-        conn.close()
+
+
+def execute_many(sql, seq_of_params):
+    """Run *sql* once per params tuple in one transaction. Returns rowcount."""
+    with transaction() as conn:
+        try:
+            return conn.executemany(sql, seq_of_params).rowcount
+        except sqlite3.Error as e:
+            log.error("execute_many error: %s | SQL: %s", e, sql[:200])
+            raise
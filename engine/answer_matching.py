@@ -2,8 +2,20 @@
 
 Returns (is_correct, is_close) tuples.
 """
+import math
 import re
 
+_PUNCT_RE = re.compile(r'[^\w\s\d./%$-]')
+# The ASCII characters _PUNCT_RE deletes, for bytes.translate on ASCII text
+# (several times faster than the regex, and than str.translate)
+_ASCII_PUNCT = bytes(c for c in range(128) if _PUNCT_RE.match(chr(c)))
+# MCQ answer letters in either case -> uppercase
+_LETTERS = {c: c.upper() for c in 'abcdABCD'}
+# Letter prefix on a normalized (lowercased) option, e.g. "a) " or "b. "
+_OPTION_PREFIX_RE = re.compile(r'^[a-d][.)\s]+\s*')
+_DROP_COMMAS = str.maketrans('', '', ',')
+_NUMBER_START = frozenset('0123456789+-.')
+
 
 def check_answer(student_answer, correct_answer, question_type='short_answer',
                   options=None):
@@ -15,6 +27,20 @@ def check_answer(student_answer, correct_answer, question_type='short_answer',
     if not student_answer or not correct_answer:
         return False, False
 
+    # Fast paths before any normalization: identical input, and plain
+    # numbers (most math answers). Numeric mismatches take the full path.
+    if student_answer == correct_answer:
+        return True, False
+    if question_type != 'mcq':
+        c_num = _fast_number(correct_answer)
+        if c_num is not None:
+            s_num = _fast_number(student_answer)
+            if s_num is not None:
+                if abs(s_num - c_num) < 1e-9:
+                    return True, False
+                if c_num != 0 and abs(s_num - c_num) / abs(c_num) < 0.01:
+                    return False, True  # within 1%
+
     student = _normalize(student_answer)
     correct = _normalize(correct_answer)
 
@@ -62,7 +88,7 @@ def _check_mcq(student, correct, options=None):
     if options:
         norm_opts = [_normalize(o) for o in options]
         # Strip letter prefixes from options for matching
-        clean_opts = [re.sub(r'^[a-d][.)\s]+\s*', '', o).strip() for o in norm_opts]
+        clean_opts = [_OPTION_PREFIX_RE.sub('', o).strip() for o in norm_opts]
 
         # Student submitted text, correct is letter → find correct text
         if not s_letter and c_letter:
@@ -93,7 +119,10 @@ def _check_mcq(student, correct, options=None):
 def _normalize(text):
     """Lowercase, strip whitespace and punctuation."""
     text = str(text).strip().lower()
-    text = re.sub(r'[^\w\s\d./%$-]', '', text)
+    if text.isascii():
+        text = text.encode('ascii').translate(None, _ASCII_PUNCT).decode('ascii')
+    else:
+        text = _PUNCT_RE.sub('', text)
     return text.strip()
 
 
@@ -106,14 +135,30 @@ def _to_number(text):
         return None
 
 
+def _fast_number(text):
+    """Parse raw input as a finite number (commas allowed), else None.
+
+    Input that doesn't start like a number is rejected without trying
+    float(), since a failed parse (exception) costs more than the regex path.
+    """
+    text = str(text).lstrip()
+    if not text or text[0] not in _NUMBER_START:
+        return None
+    try:
+        num = float(text.translate(_DROP_COMMAS))
+    except ValueError:
+        return None
+    return num if math.isfinite(num) else None
+
+
 def _extract_letter(text):
-    """Extract a single letter answer (A-D)."""
-    text = text.strip().upper()
-    if len(text) == 1 and text in 'ABCD':
-        return text
-    match = re.match(r'^([A-D])[.)\s]', text.upper())
-    if match:
-        return match.group(1)
+    """Extract a single letter answer (A-D): "b", "B)", "c. 42"."""
+    text = text.strip()
+    if not text:
+        return None
+    letter = _LETTERS.get(text[0])
+    if letter and (len(text) == 1 or text[1] in '.)' or text[1].isspace()):
+        return letter
     return None
 
 
@@ -121,8 +166,6 @@ def _is_close(student, correct):
     """Simple closeness check using character overlap."""
     if not student or not correct:
         return False
-    common = set(student) & set(correct)
-    if len(correct) == 0:
-        return False
-    overlap = len(common) / len(set(correct))
+    correct_chars = set(correct)
+    overlap = len(correct_chars.intersection(student)) / len(correct_chars)
     return overlap > 0.7
@@ -5,6 +5,7 @@ Algorithm:
 2. Select focus node: NEVER same node twice, score by need + recency
 3. Compute target difficulty from ELO + recent calibration
 """
+import functools
 import json
 
 from engine import elo
@@ -22,6 +23,9 @@ VISUAL_REQUIRED_NODES = {
     'Partitioning into Equal Shares',
 }
 
+# Shared read-only stand-in for nodes the student has no skill row for
+_NO_SKILL = {}
+
 
 def analyze_recent(recent_attempts, student_skills):
     """Analyze last 30 attempts for per-node stats, overall accuracy, recency.
@@ -42,29 +46,38 @@ def analyze_recent(recent_attempts, student_skills):
             'last_seen': {},
         }
 
-    total_correct = sum(1 for a in recent_attempts if a['is_correct'])
-    overall_accuracy = total_correct / len(recent_attempts)
-
-    # Per-node stats
+    # Single pass: per-node stats, recency (index 0 = most recent attempt),
+    # and correct counts for each half (the newer half is [:half])
+    n = len(recent_attempts)
+    half = n // 2
     per_node = {}
-    for a in recent_attempts:
+    last_seen = {}
+    newer_correct = older_correct = 0
+    for i, a in enumerate(recent_attempts):
         nid = a['curriculum_node_id']
-        if nid not in per_node:
-            per_node[nid] = {'results': [], 'count': 0, 'correct': 0}
+        stats = per_node.get(nid)
+        if stats is None:
+            stats = per_node[nid] = {'results': [], 'count': 0, 'correct': 0}
+            if nid:
+                last_seen[nid] = i
         is_correct = bool(a['is_correct'])
-        per_node[nid]['results'].append(is_correct)
-        per_node[nid]['count'] += 1
+        stats['results'].append(is_correct)
+        stats['count'] += 1
         if is_correct:
-            per_node[nid]['correct'] += 1
+            stats['correct'] += 1
+            if i < half:
+                newer_correct += 1
+            else:
+                older_correct += 1
 
-    for nid, stats in per_node.items():
-        stats['accuracy'] = stats['correct'] / stats['count'] if stats['count'] else 0
+    overall_accuracy = (newer_correct + older_correct) / n
+    for stats in per_node.values():
+        stats['accuracy'] = stats['correct'] / stats['count']
 
-    # Improvement trend: compare first half vs second half
-    half = len(recent_attempts) // 2
+    # Improvement trend: compare first (older) half vs second (newer) half
     if half >= 3:
-        first_half = sum(1 for a in recent_attempts[half:] if a['is_correct']) / (len(recent_attempts) - half)
-        second_half = sum(1 for a in recent_attempts[:half] if a['is_correct']) / half
+        first_half = older_correct / (n - half)
+        second_half = newer_correct / half
         if second_half - first_half > 0.1:
             trend = 'improving'
         elif first_half - second_half > 0.1:
@@ -74,14 +87,6 @@ def analyze_recent(recent_attempts, student_skills):
     else:
         trend = 'stable'
 
-    # Recency: how many questions ago was each node last seen?
-    # Index 0 = most recent attempt
-    last_seen = {}
-    for i, a in enumerate(recent_attempts):
-        nid = a.get('curriculum_node_id')
-        if nid and nid not in last_seen:
-            last_seen[nid] = i
-
     return {
         'overall_accuracy': overall_accuracy,
         'per_node': per_node,
@@ -114,10 +119,43 @@ def select_focus_node(recent_analysis, curriculum_nodes, student_skills,
     per_node = recent_analysis.get('per_node', {})
     last_seen = recent_analysis.get('last_seen', {})
 
-    # Build eligible pool: unmastered nodes with accessible prerequisites
-    eligible = _get_eligible_nodes(curriculum_nodes, student_skills)
+    # One pass over the eligible pool (unmastered, prerequisites accessible),
+    # scoring each node by need + recency + virgin bonus as it is found.
+    # Hard rule: the current node only competes when nothing else is
+    # eligible (never same node twice in a row).
+    skill_get = student_skills.get
+    seen_get = last_seen.get
+    any_eligible = has_other = False
+    best_id, best_score = None, -1.0
+    current_score = None
+    for node in _iter_eligible_nodes(curriculum_nodes, student_skills, nodes_by_id):
+        any_eligible = True
+        nid = node['id']
+        skill = skill_get(nid, _NO_SKILL)
+        need = 1.0 - skill.get('mastery_level', 0.0)
+
+        # Recency: how many questions since last asked?
+        recency_bonus = seen_get(nid, 99) / 3.0
+        if recency_bonus > 2.0:
+            recency_bonus = 2.0
 
-    if not eligible:
+        score = need * (0.5 + recency_bonus)
+
+        # Virgin node bonus: introduce new topics
+        if skill.get('total_attempts', 0) == 0:
+            score += 0.5
+
+        if nid == current_node_id:
+            if current_score is None or score > current_score:
+                current_score = score
+            continue
+
+        has_other = True
+        if score > best_score:
+            best_score = score
+            best_id = nid
+
+    if not any_eligible:
         # All mastered — return least mastered for continued practice
         return _least_mastered_id(curriculum_nodes, student_skills)
 
@@ -131,66 +169,59 @@ def select_focus_node(recent_analysis, curriculum_nodes, student_skills,
             if prereq and prereq != current_node_id:
                 return prereq
 
-    # Hard rule: exclude current node (never same node twice in a row)
-    candidates = [n for n in eligible if n['id'] != current_node_id]
-    if not candidates:
-        candidates = eligible  # only 1 eligible node — use it
-
-    # Score candidates by need + recency + virgin bonus
-    best_id, best_score = None, -1.0
-    for node in candidates:
-        skill = student_skills.get(node['id'], {})
-        mastery = skill.get('mastery_level', 0.0)
-        need = 1.0 - mastery
-
-        # Recency: how many questions since last asked?
-        recency = last_seen.get(node['id'], 99)
-        recency_bonus = min(recency / 3.0, 2.0)
-
-        # Virgin node bonus: introduce new topics
-        attempts = skill.get('total_attempts', 0)
-        virgin_bonus = 0.5 if attempts == 0 else 0.0
-
-        score = need * (0.5 + recency_bonus) + virgin_bonus
-
-        if score > best_score:
-            best_score = score
-            best_id = node['id']
-
+    if not has_other and current_score > best_score:
+        return current_node_id  # only 1 eligible node — use it
     return best_id
 
 
-def _get_eligible_nodes(curriculum_nodes, student_skills):
+def _get_eligible_nodes(curriculum_nodes, student_skills, node_ids=None):
     """Get unmastered nodes whose prerequisites are accessible.
 
     Prerequisites are "accessible" if mastered OR attempted 2+ times.
     This allows variety without hard-locking behind sequential mastery.
+
+    node_ids is any container of the topic's node ids; callers that have
+    already built an id -> node map can pass it to skip rebuilding a set.
     """
-    eligible = []
-    node_ids = {n['id'] for n in curriculum_nodes}
+    return list(_iter_eligible_nodes(curriculum_nodes, student_skills, node_ids))
+
+
+def _iter_eligible_nodes(curriculum_nodes, student_skills, node_ids=None):
+    """Yield the nodes _get_eligible_nodes would return, in curriculum order."""
+    if node_ids is None:
+        node_ids = {n['id'] for n in curriculum_nodes}
+    skill_get = student_skills.get
+    is_mastered = elo.is_mastered
+    # Many nodes share prerequisites; check each one once per call
+    accessible_ids = {}
 
     for node in curriculum_nodes:
         # Skip nodes that require visual aids we can't generate yet
         if node.get('name') in VISUAL_REQUIRED_NODES:
             continue
 
-        skill = student_skills.get(node['id'], {})
-        if elo.is_mastered(skill.get('mastery_level', 0.0)):
+        skill = skill_get(node['id'], _NO_SKILL)
+        if is_mastered(skill.get('mastery_level', 0.0)):
             continue
 
-        prereqs = _get_prerequisite_ids(node)
-        if prereqs:
-            accessible = all(
-                elo.is_mastered(student_skills.get(pid, {}).get('mastery_level', 0.0))
-                or student_skills.get(pid, {}).get('total_attempts', 0) >= 2
-                for pid in prereqs
-                if pid in node_ids
-            )
-            if not accessible:
+        accessible = True
+        for pid in _get_prerequisite_ids(node):
+            if pid not in node_ids:
                 continue
+            ok = accessible_ids.get(pid)
+            if ok is None:
+                p_skill = skill_get(pid, _NO_SKILL)
+                ok = accessible_ids[pid] = (
+                    is_mastered(p_skill.get('mastery_level', 0.0))
+                    or p_skill.get('total_attempts', 0) >= 2
+                )
+            if not ok:
+                accessible = False
+                break
+        if not accessible:
+            continue
 
-        eligible.append(node)
-    return eligible
+        yield node
 
 
 def _find_weak_prerequisite(node, student_skills, nodes_by_id):
@@ -198,7 +229,7 @@ def _find_weak_prerequisite(node, student_skills, nodes_by_id):
     prereqs = _get_prerequisite_ids(node)
     for pid in prereqs:
         if pid in nodes_by_id:
-            p_skill = student_skills.get(pid, {})
+            p_skill = student_skills.get(pid, _NO_SKILL)
             if not elo.is_mastered(p_skill.get('mastery_level', 0.0)):
                 return pid
     return None
@@ -206,13 +237,14 @@ def _find_weak_prerequisite(node, student_skills, nodes_by_id):
 
 def _least_mastered_id(curriculum_nodes, student_skills):
     """Return the node_id with the lowest mastery level."""
+    skill_get = student_skills.get
     least_id, least_mastery = None, 1.0
     for node in curriculum_nodes:
-        skill = student_skills.get(node['id'], {})
-        m = skill.get('mastery_level', 0.0)
+        nid = node['id']
+        m = skill_get(nid, _NO_SKILL).get('mastery_level', 0.0)
         if m < least_mastery:
             least_mastery = m
-            least_id = node['id']
+            least_id = nid
     return least_id
 
 
@@ -221,16 +253,19 @@ def compute_question_params(focus_node_id, student_skills, recent_analysis):
 
     Returns (target_difficulty, question_type).
     """
-    skill = student_skills.get(focus_node_id, {})
+    skill = student_skills.get(focus_node_id, _NO_SKILL)
     total_attempts = skill.get('total_attempts', 0)
 
     # Warm-start: for untouched nodes, use the student's proven level
     # from other nodes instead of the default 800. This prevents
     # resetting to easy questions when advancing through topics.
     if total_attempts == 0:
-        rated = [s['skill_rating'] for s in student_skills.values()
-                 if s.get('total_attempts', 0) >= 3]
-        skill_rating = sum(rated) / len(rated) if rated else skill.get('skill_rating', 800.0)
+        rated_sum, n_rated = 0.0, 0
+        for s in student_skills.values():
+            if s.get('total_attempts', 0) >= 3:
+                rated_sum += s['skill_rating']
+                n_rated += 1
+        skill_rating = rated_sum / n_rated if n_rated else skill.get('skill_rating', 800.0)
     else:
         skill_rating = skill.get('skill_rating', 800.0)
 
@@ -265,8 +300,20 @@ def _get_prerequisite_ids(node):
     """Parse prerequisites JSON field."""
     prereqs = node.get('prerequisites', '[]')
     if isinstance(prereqs, str):
-        try:
-            return json.loads(prereqs)
-        except (json.JSONDecodeError, TypeError):
-            return []
+        return _parse_prerequisites(prereqs)
     return prereqs if isinstance(prereqs, list) else []
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_prerequisites(raw):
+    """Parse a prerequisites JSON string into a tuple of node ids.
+
+    Node rows are re-read on every selection, but the strings repeat, so
+    each distinct value is parsed once. A tuple keeps cached results
+    immutable.
+    """
+    try:
+        parsed = json.loads(raw)
+    except json.JSONDecodeError:
+        return ()
+    return tuple(parsed) if isinstance(parsed, list) else ()
@@ -1,9 +1,16 @@
 """Question similarity detection to avoid similar follow-up questions."""
+import functools
 import re
 from difflib import SequenceMatcher
+
 from engine.question_options import SIMILARITY_THRESHOLD
 
+_NUM_RE = re.compile(r'\d+\.?\d*')
+_VAR_RE = re.compile(r'\b[a-z]\b')
+_WS_RE = re.compile(r'\s+')
+
 
+@functools.lru_cache(maxsize=4096)
 def normalize_question_text(text):
     """Normalize question text for comparison.
 
@@ -19,14 +26,14 @@ def normalize_question_text(text):
     text = text.lower()
 
     # Replace numbers (0-9, decimals, fractions) with placeholder
-    text = re.sub(r'\d+\.?\d*', '?', text)
+    text = _NUM_RE.sub('?', text)
 
     # Remove only single-letter variable names (standalone a-z)
     # Keep multi-letter words that differentiate questions
-    text = re.sub(r'\b[a-z]\b', '', text)
+    text = _VAR_RE.sub('', text)
 
     # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
 
     return text.strip()
 
@@ -48,16 +55,24 @@ def text_similarity(text1, text2):
     return SequenceMatcher(None, norm1, norm2).ratio()
 
 
-def is_similar_to_any(question_text, exclude_questions, threshold=SIMILARITY_THRESHOLD):
+def is_similar_to_any(question_text, exclude_questions, threshold=SIMILARITY_THRESHOLD,
+                      first_match=False):
     """Check if question is similar to any excluded question.
 
     Args:
         question_text: The new question text to check
-        exclude_questions: List of question texts to compare against
+        exclude_questions: Iterable of question texts to compare against
         threshold: Similarity threshold (0-1). Default 0.7 means 70% similar.
+        first_match: Stop at the first question reaching the threshold. The
+            returned question/score are then that match, not necessarily the
+            closest one — enough for callers that only need the verdict.
 
     Returns:
         (is_similar: bool, most_similar: str or None, similarity_score: float)
+
+    Scores are text_similarity's. The new question is normalized once, and
+    candidates whose cheap upper bound (quick_ratio) can't beat the best
+    score so far skip the full ratio() computation.
     """
     if not exclude_questions:
         return False, None, 0.0
@@ -65,11 +80,25 @@ def is_similar_to_any(question_text, exclude_questions, threshold=SIMILARITY_THR
     max_similarity = 0.0
     most_similar_question = None
 
-    for excluded_text in exclude_questions:
-        similarity = text_similarity(question_text, excluded_text)
-        if similarity > max_similarity:
-            max_similarity = similarity
-            most_similar_question = excluded_text
+    norm_question = normalize_question_text(question_text) if question_text else ''
+    if norm_question:
+        matcher = SequenceMatcher(None, norm_question)
+        for excluded_text in exclude_questions:
+            if not excluded_text:
+                continue
+            norm_excluded = normalize_question_text(excluded_text)
+            if not norm_excluded:
+                continue
+            matcher.set_seq2(norm_excluded)
+            if (matcher.real_quick_ratio() <= max_similarity
+                    or matcher.quick_ratio() <= max_similarity):
+                continue
+            similarity = matcher.ratio()
+            if similarity > max_similarity:
+                max_similarity = similarity
+                most_similar_question = excluded_text
+                if similarity == 1.0 or (first_match and similarity >= threshold):
+                    break
 
     is_similar = max_similarity >= threshold
     return is_similar, most_similar_question, max_similarity
@@ -3,16 +3,21 @@
 15 rules that catch bad LLM output before it reaches the student.
 Returns (is_valid, rejection_reason) tuple.
 """
-import ast
+import functools
 import re
 
 MAX_ANSWER_LENGTH = 200
 MIN_QUESTION_LENGTH = 10
 MIN_CHOICES = 3
 
+# Validation results kept for repeated (question, answer, options, ...) inputs —
+# retries and reused cached questions often re-validate identical output
+VALIDATION_CACHE_SIZE = 4096
+
 PLACEHOLDER_ANSWERS = {'', '?', '...', 'n/a', 'none', 'null', 'tbd', 'unknown'}
 
 PLACEHOLDER_PATTERNS = ['[shows', '[image', '[picture', '[display', '[insert', '[x ', '[x>', '[x<']
+_PLACEHOLDER_RE = re.compile('|'.join(map(re.escape, PLACEHOLDER_PATTERNS)))
 
 BANNED_CHOICES = {
     'all of the above', 'none of the above',
@@ -35,7 +40,26 @@ REQUIRES_VISUAL_PATTERNS = [
     'the bar graph', 'the pictograph', 'the tally chart',
 ]
 
-LETTER_PREFIX_RE = re.compile(r'^[A-Da-d][).\s]+\s*')
+_LETTER_PREFIX_CHARS = frozenset('ABCDabcd')
+# MCQ answer letter → option index
+_LETTER_INDEX = {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'A': 0, 'B': 1, 'C': 2, 'D': 3}
+
+
+def _strip_letter_prefix(text):
+    """Drop an MCQ letter prefix: "B) cat" / "b. cat" / "B cat" → "cat".
+
+    Hand-rolled equivalent of re.sub(r'^[A-Da-d][).\\s]+\\s*', '', text): a
+    letter A-D followed by a run of ')', '.' and whitespace.
+    """
+    if not isinstance(text, str):
+        raise TypeError(f'expected str, got {type(text).__name__}')
+    if len(text) < 2 or text[0] not in _LETTER_PREFIX_CHARS:
+        return text
+    i, n = 1, len(text)
+    while i < n and (text[i] == ')' or text[i] == '.' or text[i].isspace()):
+        i += 1
+    return text[i:] if i > 1 else text
+
 
 IMPERATIVE_VERBS = {
     'simplify', 'solve', 'calculate', 'count', 'find', 'convert',
@@ -44,11 +68,6 @@ IMPERATIVE_VERBS = {
     'identify', 'explain', 'describe', 'compare',
 }
 
-# Patterns where answer appearing in question is expected
-MATH_EXPRESSION_RE = re.compile(
-    r'[\d\s+\-*/×÷=<>()]+', re.UNICODE
-)
-
 
 def validate_question(q_data, node_description=''):
     """Validate a generated question dict.
@@ -60,100 +79,190 @@ def validate_question(q_data, node_description=''):
     Returns:
         (is_valid, reason) — reason is '' if valid.
     """
+    key = _validation_key(q_data, node_description)
+    if key is None:
+        return _validate_question(q_data, node_description)
+    return _validate_cached(*key)
+
+
+# The q_data fields the rules read
+_VALIDATED_FIELDS = ('question', 'correct_answer', 'options', 'explanation', 'question_type')
+_MISSING = object()
+
+
+def _validation_key(q_data, node_description):
+    """Build a hashable cache key from the fields validation reads, or None.
+
+    Only the usual shape is cached — str fields and a list of str options —
+    so a key can't conflate inputs that validate differently (3 vs '3', a
+    list vs a tuple of options). Absent fields stay distinct from None.
+    """
+    if type(node_description) is not str:
+        return None
+    key = []
+    for field in _VALIDATED_FIELDS:
+        value = q_data.get(field, _MISSING)
+        if value is None or value is _MISSING or type(value) is str:
+            pass
+        elif field == 'options' and type(value) is list \
+                and all(type(o) is str for o in value):
+            value = tuple(value)
+        else:
+            return None
+        key.append(value)
+    key.append(node_description)
+    return key
+
+
+@functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _validate_cached(question, correct_answer, options, explanation, question_type,
+                     node_description):
+    """Run the rules on q_data rebuilt from a _validation_key."""
+    values = (question, correct_answer,
+              list(options) if type(options) is tuple else options,
+              explanation, question_type)
+    q_data = {f: v for f, v in zip(_VALIDATED_FIELDS, values) if v is not _MISSING}
+    return _validate_question(q_data, node_description)
+
+
+def _validate_question(q_data, node_description):
+    """Apply the validation rules in order; see validate_question."""
     question = str(q_data.get('question') or '').strip()
     answer = str(q_data.get('correct_answer') or '').strip()
     choices = q_data.get('options') or []
     if not isinstance(choices, list):
         choices = []
+    q_lower = question.lower()
+
+    # Rules run cheapest first, so most rejections cost only the checks
+    # before them: length and substring tests on the question/answer (rule 5
+    # is a substring test unless the answer appears in the question), then
+    # the choice checks, then scans of the whole question, and the
+    # regex/arithmetic verification (13-15) near the end. Rule 18 stays last,
+    # as it always was, since it reads the raw (possibly non-str) answer.
+    # Numbers are the rules' stable names, not their order. A question
+    # breaking several rules is reported by whichever runs first; the
+    # verdict doesn't depend on order.
 
     # Rule 1: Question text minimum length
     if len(question) < MIN_QUESTION_LENGTH:
         return False, f'Question too short ({len(question)} chars, min {MIN_QUESTION_LENGTH})'
 
     # Rule 2: Answer not empty or placeholder
-    if answer.lower() in PLACEHOLDER_ANSWERS:
+    a_lower = answer.lower()
+    if a_lower in PLACEHOLDER_ANSWERS:
         return False, f'Answer is empty or placeholder: "{answer}"'
 
-    # Rule 3: Choices must be unique (if provided) — strip letter prefixes
-    if choices:
-        normalized = [LETTER_PREFIX_RE.sub('', c).strip().lower() for c in choices]
-        if len(normalized) != len(set(normalized)):
-            return False, 'Duplicate choices'
+    # Rule 7: Answer max length
+    if len(answer) > MAX_ANSWER_LENGTH:
+        return False, f'Answer too long ({len(answer)} chars, max {MAX_ANSWER_LENGTH})'
 
-    # Rule 4: Correct answer must be among choices (if provided)
-    if choices:
-        # Strip letter prefixes from answer before comparing (e.g., "A) Paris" → "Paris")
-        answer_stripped = LETTER_PREFIX_RE.sub('', answer).strip()
-        answer_lower = answer_stripped.lower()
-        # Strip letter prefixes from choices before comparing (e.g., "A) 12" → "12")
-        choice_lowers = [LETTER_PREFIX_RE.sub('', c).strip().lower() for c in choices]
-        # Also check just the letter (A, B, C, D)
-        letter_match = answer_lower in ('a', 'b', 'c', 'd')
-        text_match = answer_lower in choice_lowers
-        # Check if answer letter corresponds to a choice
-        idx_match = False
-        if len(answer_lower) == 1 and answer_lower in 'abcd':
-            idx = ord(answer_lower) - ord('a')
-            idx_match = idx < len(choices)
-        if not (text_match or letter_match or idx_match):
-            return False, 'Correct answer not found in choices'
+    # Rule 8: No HTML/markdown artifacts
+    if '</' in question or '```' in question:
+        return False, 'HTML or markdown artifacts in question'
+    if '</' in answer or '```' in answer:
+        return False, 'HTML or markdown artifacts in answer'
 
     # Rule 5: Answer not given away in question text
     # Strip MCQ letter prefix (e.g., "C) x > -3" → "x > -3") before checking
-    answer_text = LETTER_PREFIX_RE.sub('', answer).strip()
-    if len(answer_text) > 1 and not _answer_in_question_is_ok(question, answer_text, choices):
-        q_lower = question.lower()
-        if answer_text.lower() in q_lower:
+    answer_text = _strip_letter_prefix(answer).strip()
+    if len(answer_text) > 1:
+        answer_text_lower = answer_text.lower()
+        if (answer_text_lower in q_lower
+                and not _answer_in_question_is_ok(question, q_lower, answer_text_lower)):
             return False, 'Answer given away in question text'
 
-    # Rule 6: No placeholder text
-    q_lower = question.lower()
-    for pattern in PLACEHOLDER_PATTERNS:
-        if pattern in q_lower:
-            return False, f'Placeholder text found: "{pattern}"'
+    # Rule 6: No placeholder text (every pattern starts with '[')
+    if '[' in q_lower and _PLACEHOLDER_RE.search(q_lower):
+        # Report the first listed pattern, as the rejection reason always has
+        pattern = next(p for p in PLACEHOLDER_PATTERNS if p in q_lower)
+        return False, f'Placeholder text found: "{pattern}"'
 
     # Rule 6b: No questions requiring unseen visuals/physical objects
     for pattern in REQUIRES_VISUAL_PATTERNS:
         if pattern in q_lower:
             return False, f'Question requires visual context: "{pattern}"'
 
-    # Rule 7: Answer max length
-    if len(answer) > MAX_ANSWER_LENGTH:
-        return False, f'Answer too long ({len(answer)} chars, max {MAX_ANSWER_LENGTH})'
-
-    # Rule 8: No HTML/markdown artifacts
-    if '</' in question or '```' in question:
-        return False, 'HTML or markdown artifacts in question'
-    if '</' in answer or '```' in answer:
-        return False, 'HTML or markdown artifacts in answer'
-
     # Rule 9: Minimum 3 choices (if choices provided)
     if choices and len(choices) < MIN_CHOICES:
         return False, f'Too few choices ({len(choices)}, min {MIN_CHOICES})'
 
-    # Rule 10: Answer length bias prevention
+    # Rules 3, 11, 4 and 10 all inspect the choices: gather what they need
+    # in one pass, then apply them below. Rule 16 reuses choice_lowers.
+    choice_lowers = []
     if choices:
-        distractor_lens = [len(c.strip()) for c in choices if c.strip().lower() != answer.lower()]
-        if distractor_lens:
-            avg_distractor = sum(distractor_lens) / len(distractor_lens)
-            max_distractor = max(distractor_lens)
-            if len(answer) > avg_distractor * 3 and len(answer) > max_distractor + 15:
-                return False, 'Answer much longer than distractors (length bias)'
+        normalized = set()  # letter prefix stripped, lowercased (e.g. "A) 12" → "12")
+        has_duplicate = False
+        banned_choice = None
+        distractor_total = distractor_count = distractor_max = 0
+        for c in choices:
+            stripped = _strip_letter_prefix(c).strip().lower()
+            if stripped in normalized:
+                has_duplicate = True
+            normalized.add(stripped)
+            raw = c.strip()
+            raw_lower = raw.lower()
+            choice_lowers.append(raw_lower)
+            if banned_choice is None and (stripped in BANNED_CHOICES
+                                          or raw_lower in BANNED_CHOICES):
+                banned_choice = raw
+            if raw_lower != a_lower:
+                distractor_total += len(raw)
+                distractor_count += 1
+                if len(raw) > distractor_max:
+                    distractor_max = len(raw)
+
+    # Rule 3: Choices must be unique (if provided) — strip letter prefixes
+    if choices and has_duplicate:
+        return False, 'Duplicate choices'
 
     # Rule 11: No "all/none of the above" choices — strip letter prefixes
+    if choices and banned_choice is not None:
+        return False, f'Banned choice: "{banned_choice}"'
+
+    # Rule 4: Correct answer must be among choices (if provided)
     if choices:
-        for c in choices:
-            stripped = LETTER_PREFIX_RE.sub('', c).strip().lower()
-            if stripped in BANNED_CHOICES or c.strip().lower() in BANNED_CHOICES:
-                return False, f'Banned choice: "{c.strip()}"'
+        # Strip letter prefixes from answer before comparing (e.g., "A) Paris" → "Paris")
+        answer_stripped = _strip_letter_prefix(answer).strip()
+        answer_lower = answer_stripped.lower()
+        # Also check just the letter (A, B, C, D)
+        letter_match = answer_lower in ('a', 'b', 'c', 'd')
+        text_match = answer_lower in normalized
+        # Check if answer letter corresponds to a choice
+        idx = _LETTER_INDEX.get(answer_lower)
+        idx_match = idx is not None and idx < len(choices)
+        if not (text_match or letter_match or idx_match):
+            return False, 'Correct answer not found in choices'
+
+    # Rule 10: Answer length bias prevention
+    if choices and distractor_count:
+        avg_distractor = distractor_total / distractor_count
+        if len(answer) > avg_distractor * 3 and len(answer) > distractor_max + 15:
+            return False, 'Answer much longer than distractors (length bias)'
 
     # Rule 12: Question must have punctuation, blank, or imperative verb
-    has_punctuation = bool(re.search(r'[?:.]', question))
-    has_blank = '__' in question
-    first_word = question.split()[0].lower().rstrip(':') if question.split() else ''
-    has_imperative = first_word in IMPERATIVE_VERBS
-    if not (has_punctuation or has_blank or has_imperative):
-        return False, 'Question lacks punctuation or imperative verb'
+    has_punctuation = '?' in question or ':' in question or '.' in question
+    if not (has_punctuation or '__' in question):
+        words = q_lower.split(None, 1)
+        first_word = words[0].rstrip(':') if words else ''
+        if first_word not in IMPERATIVE_VERBS:
+            return False, 'Question lacks punctuation or imperative verb'
+
+    # Rule 16: Reject text descriptions of visual diagrams
+    desc_ok, desc_reason = _check_visual_descriptions(q_lower, choice_lowers)
+    if not desc_ok:
+        return False, desc_reason
+
+    # Rule 17: Reject "graph/draw/sketch/plot" imperatives
+    draw_ok, draw_reason = _check_draw_imperatives(q_lower)
+    if not draw_ok:
+        return False, draw_reason
+
+    # Rule 19: Check for multiple correct answers in context
+    # Example: "Which is even: 13, 24, 37, 48, 59?" has TWO correct answers (24 AND 48)
+    multi_ok, multi_reason = _check_multiple_correct_answers(question, answer, choices)
+    if not multi_ok:
+        return False, multi_reason
 
     # Rule 13: Mathematical answer verification
     math_ok, math_reason = verify_math_answer(q_data)
@@ -170,27 +279,11 @@ def validate_question(q_data, node_description=''):
     if not arith_ok:
         return False, arith_reason
 
-    # Rule 16: Reject text descriptions of visual diagrams
-    desc_ok, desc_reason = _check_visual_descriptions(question, choices)
-    if not desc_ok:
-        return False, desc_reason
-
-    # Rule 17: Reject "graph/draw/sketch/plot" imperatives
-    draw_ok, draw_reason = _check_draw_imperatives(question)
-    if not draw_ok:
-        return False, draw_reason
-
     # Rule 18: Distractor quality check (MCQ only) — reject nonsensical options
     dist_ok, dist_reason = verify_distractor_quality(q_data)
     if not dist_ok:
         return False, dist_reason
 
-    # Rule 19: Check for multiple correct answers in context
-    # Example: "Which is even: 13, 24, 37, 48, 59?" has TWO correct answers (24 AND 48)
-    multi_ok, multi_reason = _check_multiple_correct_answers(question, answer, choices)
-    if not multi_ok:
-        return False, multi_reason
-
     return True, ''
 
 
@@ -198,35 +291,161 @@ def validate_question(q_data, node_description=''):
 # Rule 13 helpers: Mathematical answer verification
 # ---------------------------------------------------------------------------
 
+_EXPR_CHARS = frozenset('0123456789+-*/ .')
+# Python number literals (ints, "1.5", "1.", ".5"), operators, and a stray
+# '.' so malformed numbers surface as a token the parser rejects
+_EXPR_TOKEN_RE = re.compile(r'[0-9]+\.[0-9]*|\.[0-9]+|[0-9]+|[+\-*/.]')
+
+
 def _safe_eval_expr(expr):
-    """Safely evaluate a simple arithmetic expression using AST.
+    """Safely evaluate a simple arithmetic expression.
 
-    Only allows integer/float literals and +, -, *, / operators.
+    Only allows integer/float literals, binary +, -, *, / and unary minus,
+    with Python's precedence and result types (so "12 / 4" is 3.0).
     Returns a number or None if the expression is unsafe or invalid.
     """
-    allowed_chars = set('0123456789+-*/ .')
-    if not all(c in allowed_chars for c in expr):
-        return None
-    try:
-        tree = ast.parse(expr.strip(), mode='eval')
-    except SyntaxError:
+    if not _EXPR_CHARS.issuperset(expr):
         return None
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.Expression, ast.BinOp, ast.UnaryOp)):
-            continue
-        if isinstance(node, (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.USub)):
-            continue
-        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
-            continue
-        return None  # disallowed node type
+    tokens = _EXPR_TOKEN_RE.findall(expr)
+    n = len(tokens)
     try:
-        return eval(compile(tree, '<expr>', 'eval'))
+        i, total, add_op = 0, None, '+'
+        while True:
+            # term := operand (('*' | '/') operand)*
+            term, i = _expr_operand(tokens, i, n)
+            if term is None:
+                return None
+            while i < n and (tokens[i] == '*' or tokens[i] == '/'):
+                op = tokens[i]
+                rhs, i = _expr_operand(tokens, i + 1, n)
+                if rhs is None:
+                    return None
+                term = term * rhs if op == '*' else term / rhs
+            if total is None:
+                total = term
+            elif add_op == '+':
+                total = total + term
+            else:
+                total = total - term
+            if i == n:
+                return total
+            add_op = tokens[i]
+            if add_op != '+' and add_op != '-':
+                return None
+            i += 1
     except (ZeroDivisionError, OverflowError):
         return None
 
 
-# Unicode dash variants: hyphen-minus, minus sign, en-dash, em-dash
-_DASH_RE = re.compile(r'[−–—]')
+def _expr_operand(tokens, i, n):
+    """Parse a number with optional leading minus signs at tokens[i].
+
+    Returns (value, next index), or (None, i) if there is no valid number —
+    including literals Python rejects such as "07" and unary plus.
+    """
+    negative = False
+    while i < n and tokens[i] == '-':
+        negative = not negative
+        i += 1
+    if i == n:
+        return None, i
+    tok = tokens[i]
+    if '.' in tok:
+        if tok == '.':
+            return None, i
+        value = float(tok)
+    elif tok[0] in '+*/':
+        return None, i
+    elif tok[0] == '0' and tok.strip('0'):
+        return None, i  # leading zeros aren't a valid int literal
+    else:
+        value = int(tok)
+    return (-value if negative else value), i + 1
+
+
+# Unicode dash variants: minus sign, en-dash, em-dash
+_DASHES = ('−', '–', '—')
+
+
+def _normalize_dashes(text):
+    """Replace unicode dash variants with hyphen-minus.
+
+    str.isascii() is O(1) on CPython, so ASCII text skips the scan entirely.
+    """
+    if text.isascii():
+        return text
+    for dash in _DASHES:
+        text = text.replace(dash, '-')
+    return text
+
+
+# Comparison questions pick between values rather than compute one
+_COMPARISON_RE = re.compile(
+    r'which is (?:bigger|larger|smaller|greater|less|more)|compare|order'
+)
+
+# Patterns for _try_compute_answer, in the order they are tried
+_EXPR_RE = re.compile(r'(\d+(?:\s*[+\-*/]\s*\d+)+)')
+_PLUS_RE = re.compile(r'(\d+)\s+plus\s+(\d+)(?:\s+plus\s+(\d+))?')
+_MINUS_RE = re.compile(r'(\d+)\s+minus\s+(\d+)')
+_TIMES_RE = re.compile(r'(\d+)\s+times\s+(\d+)')
+_DIVIDED_BY_RE = re.compile(r'(\d+)\s+divided\s+by\s+(\d+)')
+_MULTIPLY_THEN_DIVIDE_RE = re.compile(
+    r'multipl(?:y|ying)\s+(\d+)\s+by\s+(\d+)'
+    r'.*?divid(?:e|ing)\s+(?:(?:the\s+result|it|that)\s+)?by\s+(\d+)'
+)
+_DIVIDE_THEN_MULTIPLY_RE = re.compile(
+    r'divid(?:e|ing)\s+(\d+)\s+by\s+(\d+)'
+    r'.*?multipl(?:y|ying)\s+(?:(?:the\s+result|it|that)\s+)?by\s+(\d+)'
+)
+_MULTIPLY_BY_RE = re.compile(r'multipl(?:y|ying)\s+(\d+)\s+by\s+(\d+)')
+_DIVIDE_BY_RE = re.compile(r'divid(?:e|ing)\s+(\d+)\s+by\s+(\d+)')
+_PRODUCT_OF_RE = re.compile(r'product\s+of\s+(\d+)\s+and\s+(\d+)')
+_SUM_OF_LIST_RE = re.compile(r'sum\s+of\s+([\d,\s]+and\s+\d+)')
+_DIGITS_RE = re.compile(r'\d+')
+_MORE_THAN_RE = re.compile(r'(\d+)\s+more\s+than\s+(\d+)')
+_LESS_THAN_RE = re.compile(r'(\d+)\s+less\s+than\s+(\d+)')
+_SUBTRACT_FROM_RE = re.compile(r'subtract\s+(\d+)\s+from\s+(\d+)')
+_ADD_AND_RE = re.compile(r'(?:add|sum\s+of)\s+(\d+)\s+and\s+(\d+)')
+_DIFFERENCE_RE = re.compile(r'difference\s+(?:between|of)\s+(\d+)\s+and\s+(\d+)')
+# Missing number equations, blank on either side: "__ + A = B", "A - ? = B"
+_MISSING_RE = re.compile(
+    r'(?:(?:_+|\?)\s*(?P<op_l>[+\-])\s*(?P<a_l>\d+)'
+    r'|(?P<a_r>\d+)\s*(?P<op_r>[+\-])\s*(?:_+|\?))'
+    r'\s*=\s*(?P<b>\d+)'
+)
+# (operator, blank on the left?) → missing value from known A and result B
+_MISSING_SOLVERS = {
+    ('+', True): lambda a, b: b - a,   # __ + A = B
+    ('+', False): lambda a, b: b - a,  # A + __ = B
+    ('-', True): lambda a, b: b + a,   # __ - A = B
+    ('-', False): lambda a, b: a - b,  # A - __ = B
+}
+_WORD_SUBTRACT_RE = re.compile(
+    r'(?:has|have|had|holds|starts?\s+with|began?\s+with|picks?\s+up|'
+    r'bought|collects?|finds?|found|carries?|bakes?|makes?|owns?)\s+(\d+)'
+    r'.*?'
+    r'(?:eats?|ate|gives?\s+away|gives?|gave|loses?|lost|spent|spends?|'
+    r'breaks?|broke|drops?|dropped|took\s+away|takes?\s+away|'
+    r'used|uses?|removes?|removed|throws?\s+away|threw\s+away|'
+    r'sold|sells?|shares?|shared|lends?|lent|returns?|returned)\s+(\d+)'
+)
+_WORD_ADD_RE = re.compile(
+    r'(?:has|have|had|holds|starts?\s+with|began?\s+with|owns?)\s+(\d+)'
+    r'.*?'
+    r'(?:gets?|receives?|finds?|found|picks?\s+up|bought|buys?|'
+    r'collects?|collected|earns?|earned|wins?|won|adds?|added|'
+    r'gets?\s+back|more)\s+(\d+)'
+)
+_WORD_REMOVED_RE = re.compile(
+    r'(?:there\s+(?:are|were|is)|(\w+)\s+(?:has|have|had))\s+(\d+)'
+    r'.*?'
+    r'(\d+)\s+(?:fly\s+away|flew\s+away|walk\s+away|walked\s+away|'
+    r'ran\s+away|run\s+away|leave|left|fall\s+off|fell\s+off|'
+    r'go\s+away|went\s+away|are\s+taken|were\s+taken|'
+    r'are\s+eaten|were\s+eaten|are\s+removed|were\s+removed|'
+    r'pop|popped|burst|break|broke)'
+)
 
 
 def _try_compute_answer(question_text):
@@ -235,21 +454,23 @@ def _try_compute_answer(question_text):
     Returns a number if the question contains a verifiable expression,
     or None if the question can't be parsed (benefit of the doubt).
     """
-    q = _DASH_RE.sub('-', question_text.lower().strip())
+    # Every pattern below needs at least one number
+    if not _DIGITS_RE.search(question_text):
+        return None
+
+    q = _normalize_dashes(question_text.lower().strip())
 
     # Normalize unicode math operators
-    q = q.replace('×', '*').replace('÷', '/')
+    if not q.isascii():
+        q = q.replace('×', '*').replace('÷', '/')
 
     # Skip comparison questions — they pick between values, not compute
-    if any(w in q for w in ('which is bigger', 'which is larger',
-                             'which is smaller', 'which is greater',
-                             'which is less', 'which is more',
-                             'compare', 'order')):
+    if _COMPARISON_RE.search(q):
         return None
 
     # --- Direct arithmetic expressions ---
     # "5 + 3", "15 - 7", "5 + 3 + 2", "8 * 4", "12 / 3", "3 × 4 ÷ 2"
-    expr_match = re.search(r'(\d+(?:\s*[+\-*/]\s*\d+)+)', q)
+    expr_match = ('+' in q or '-' in q or '*' in q or '/' in q) and _EXPR_RE.search(q)
     if expr_match:
         result = _safe_eval_expr(expr_match.group(1))
         if result is not None:
@@ -257,113 +478,95 @@ def _try_compute_answer(question_text):
 
     # --- Word-based operations ---
     # "A plus B [plus C]"
-    m = re.search(r'(\d+)\s+plus\s+(\d+)(?:\s+plus\s+(\d+))?', q)
+    m = 'plus' in q and _PLUS_RE.search(q)
     if m:
         nums = [int(g) for g in m.groups() if g is not None]
         return sum(nums)
 
     # "A minus B"
-    m = re.search(r'(\d+)\s+minus\s+(\d+)', q)
+    m = 'minus' in q and _MINUS_RE.search(q)
     if m:
         return int(m.group(1)) - int(m.group(2))
 
     # "A times B"
-    m = re.search(r'(\d+)\s+times\s+(\d+)', q)
+    m = 'times' in q and _TIMES_RE.search(q)
     if m:
         return int(m.group(1)) * int(m.group(2))
 
     # "A divided by B"
-    m = re.search(r'(\d+)\s+divided\s+by\s+(\d+)', q)
+    m = 'divided' in q and _DIVIDED_BY_RE.search(q)
     if m and int(m.group(2)) != 0:
         return int(m.group(1)) / int(m.group(2))
 
     # --- Multi-step natural language operations ---
     # "multiply A by B and/then divide by C" → (A * B) / C
-    m = re.search(
-        r'multipl(?:y|ying)\s+(\d+)\s+by\s+(\d+)'
-        r'.*?divid(?:e|ing)\s+(?:(?:the\s+result|it|that)\s+)?by\s+(\d+)',
-        q,
-    )
+    m = 'multipl' in q and _MULTIPLY_THEN_DIVIDE_RE.search(q)
     if m and int(m.group(3)) != 0:
         return (int(m.group(1)) * int(m.group(2))) / int(m.group(3))
 
     # "divide A by B and/then multiply by C" → (A / B) * C
-    m = re.search(
-        r'divid(?:e|ing)\s+(\d+)\s+by\s+(\d+)'
-        r'.*?multipl(?:y|ying)\s+(?:(?:the\s+result|it|that)\s+)?by\s+(\d+)',
-        q,
-    )
+    m = 'divid' in q and _DIVIDE_THEN_MULTIPLY_RE.search(q)
     if m and int(m.group(2)) != 0:
         return (int(m.group(1)) / int(m.group(2))) * int(m.group(3))
 
     # "multiply/multiplying A by B" → A * B (single step)
-    m = re.search(r'multipl(?:y|ying)\s+(\d+)\s+by\s+(\d+)', q)
+    m = 'multipl' in q and _MULTIPLY_BY_RE.search(q)
     if m:
         return int(m.group(1)) * int(m.group(2))
 
     # "divide/dividing A by B" → A / B (single step)
-    m = re.search(r'divid(?:e|ing)\s+(\d+)\s+by\s+(\d+)', q)
+    m = 'divid' in q and _DIVIDE_BY_RE.search(q)
     if m and int(m.group(2)) != 0:
         return int(m.group(1)) / int(m.group(2))
 
     # "product of A and B" → A * B
-    m = re.search(r'product\s+of\s+(\d+)\s+and\s+(\d+)', q)
+    m = 'product' in q and _PRODUCT_OF_RE.search(q)
     if m:
         return int(m.group(1)) * int(m.group(2))
 
     # "sum of A, B, and C" → A + B + C (comma-separated three+ addends)
-    m = re.search(r'sum\s+of\s+([\d,\s]+and\s+\d+)', q)
+    m = 'sum' in q and _SUM_OF_LIST_RE.search(q)
     if m:
-        nums = re.findall(r'\d+', m.group(1))
+        nums = _DIGITS_RE.findall(m.group(1))
         if len(nums) >= 2:
             return sum(int(n) for n in nums)
 
     # --- Phrased patterns ---
     # "N more than M" → M + N
-    m = re.search(r'(\d+)\s+more\s+than\s+(\d+)', q)
+    m = 'more' in q and _MORE_THAN_RE.search(q)
     if m:
         return int(m.group(2)) + int(m.group(1))
 
     # "N less than M" → M - N
-    m = re.search(r'(\d+)\s+less\s+than\s+(\d+)', q)
+    m = 'less' in q and _LESS_THAN_RE.search(q)
     if m:
         return int(m.group(2)) - int(m.group(1))
 
     # "subtract A from B" → B - A
-    m = re.search(r'subtract\s+(\d+)\s+from\s+(\d+)', q)
+    m = 'subtract' in q and _SUBTRACT_FROM_RE.search(q)
     if m:
         return int(m.group(2)) - int(m.group(1))
 
     # "add A and B" / "sum of A and B"
-    m = re.search(r'(?:add|sum\s+of)\s+(\d+)\s+and\s+(\d+)', q)
+    m = ('add' in q or 'sum' in q) and _ADD_AND_RE.search(q)
     if m:
         return int(m.group(1)) + int(m.group(2))
 
     # "difference between/of A and B" → |A - B|
-    m = re.search(r'difference\s+(?:between|of)\s+(\d+)\s+and\s+(\d+)', q)
+    m = 'difference' in q and _DIFFERENCE_RE.search(q)
     if m:
         return abs(int(m.group(1)) - int(m.group(2)))
 
     # --- Missing number equations ---
-    # "__ + A = B" or "? + A = B" → B - A
-    m = re.search(r'(?:_+|\?)\s*\+\s*(\d+)\s*=\s*(\d+)', q)
-    if m:
-        return int(m.group(2)) - int(m.group(1))
-
-    # "A + __ = B" or "A + ? = B" → B - A
-    m = re.search(r'(\d+)\s*\+\s*(?:_+|\?)\s*=\s*(\d+)', q)
-    if m:
-        return int(m.group(2)) - int(m.group(1))
-
-    # "__ - A = B" → B + A
-    m = re.search(r'(?:_+|\?)\s*-\s*(\d+)\s*=\s*(\d+)', q)
-    if m:
-        return int(m.group(2)) + int(m.group(1))
-
-    # "A - __ = B" → A - B
-    m = re.search(r'(\d+)\s*-\s*(?:_+|\?)\s*=\s*(\d+)', q)
+    # "__ + A = B" / "A + ? = B" → B - A, "__ - A = B" → B + A, "A - __ = B" → A - B
+    m = '=' in q and ('_' in q or '?' in q) and _MISSING_RE.search(q)
     if m:
-        return int(m.group(1)) - int(m.group(2))
+        blank_left = m.group('op_l') is not None
+        if blank_left:
+            op, a = m.group('op_l'), m.group('a_l')
+        else:
+            op, a = m.group('op_r'), m.group('a_r')
+        return _MISSING_SOLVERS[op, blank_left](int(a), int(m.group('b')))
 
     # --- "10 more/less" patterns ---
     # "What is 10 more than 45?" → 45 + 10 = 55  (already caught above)
@@ -371,44 +574,19 @@ def _try_compute_answer(question_text):
 
     # --- Word problem: subtraction ---
     # "has/have N ... eats/gives/loses/gave/spent M"
-    m = re.search(
-        r'(?:has|have|had|holds|starts?\s+with|began?\s+with|picks?\s+up|'
-        r'bought|collects?|finds?|found|carries?|bakes?|makes?|owns?)\s+(\d+)'
-        r'.*?'
-        r'(?:eats?|ate|gives?\s+away|gives?|gave|loses?|lost|spent|spends?|'
-        r'breaks?|broke|drops?|dropped|took\s+away|takes?\s+away|'
-        r'used|uses?|removes?|removed|throws?\s+away|threw\s+away|'
-        r'sold|sells?|shares?|shared|lends?|lent|returns?|returned)\s+(\d+)',
-        q
-    )
+    m = _WORD_SUBTRACT_RE.search(q)
     if m:
         return int(m.group(1)) - int(m.group(2))
 
     # --- Word problem: addition ---
     # "has/have N ... gets/receives/finds/bought M more"
-    m = re.search(
-        r'(?:has|have|had|holds|starts?\s+with|began?\s+with|owns?)\s+(\d+)'
-        r'.*?'
-        r'(?:gets?|receives?|finds?|found|picks?\s+up|bought|buys?|'
-        r'collects?|collected|earns?|earned|wins?|won|adds?|added|'
-        r'gets?\s+back|more)\s+(\d+)',
-        q
-    )
+    m = _WORD_ADD_RE.search(q)
     if m:
         return int(m.group(1)) + int(m.group(2))
 
     # --- Word problem: "N things, M verb away" (reverse order) ---
     # "There are N birds. M fly away."
-    m = re.search(
-        r'(?:there\s+(?:are|were|is)|(\w+)\s+(?:has|have|had))\s+(\d+)'
-        r'.*?'
-        r'(\d+)\s+(?:fly\s+away|flew\s+away|walk\s+away|walked\s+away|'
-        r'ran\s+away|run\s+away|leave|left|fall\s+off|fell\s+off|'
-        r'go\s+away|went\s+away|are\s+taken|were\s+taken|'
-        r'are\s+eaten|were\s+eaten|are\s+removed|were\s+removed|'
-        r'pop|popped|burst|break|broke)',
-        q
-    )
+    m = _WORD_REMOVED_RE.search(q)
     if m:
         total = int(m.group(2))
         removed = int(m.group(3))
@@ -426,21 +604,27 @@ def _resolve_answer_text(answer, options):
         return answer
 
     # Strip letter prefix: "D) 9" → "9", "B. cat" → "cat"
-    stripped = LETTER_PREFIX_RE.sub('', answer).strip()
+    stripped = _strip_letter_prefix(answer).strip()
     if stripped and stripped != answer.strip():
         return stripped
 
     # If answer is just a letter (A-D), look it up in options
-    if options and len(answer.strip()) == 1 and answer.strip().upper() in 'ABCD':
-        idx = ord(answer.strip().upper()) - ord('A')
-        if idx < len(options):
-            return LETTER_PREFIX_RE.sub('', options[idx]).strip()
+    letter = answer.strip()
+    if options:
+        idx = _LETTER_INDEX.get(letter)
+        if idx is not None and idx < len(options):
+            return _strip_letter_prefix(options[idx]).strip()
 
-    return answer.strip()
+    return letter
 
 
+@functools.lru_cache(maxsize=1024)
 def _parse_numeric(text):
-    """Try to parse a string as a number. Returns float or None."""
+    """Try to parse a string as a number. Returns float or None.
+
+    Memoized: rules 13 and 14 both parse the same resolved answer, and
+    non-numeric answers otherwise pay for a ValueError every time.
+    """
     text = text.strip()
     try:
         if '/' in text and text.count('/') == 1:
@@ -460,6 +644,10 @@ def verify_math_answer(q_data):
     - (False, reason) if computed answer differs from stated answer.
     """
     question = (q_data.get('question') or '').strip()
+    # Nothing to compute without a number in the question (spelling, reading, ...)
+    if not _DIGITS_RE.search(question):
+        return True, ''
+
     answer = str(q_data.get('correct_answer') or '').strip()
     options = q_data.get('options') or []
 
@@ -571,7 +759,7 @@ def verify_explanation_arithmetic(q_data):
         return True, ''
 
     # Normalize unicode dashes
-    explanation = _DASH_RE.sub('-', explanation)
+    explanation = _normalize_dashes(explanation)
 
     # Find all "A op B [op C ...] = N" patterns
     # e.g. "4 - 2 = 3", "5 + 3 + 2 = 10", "6 * 4 = 24"
@@ -596,27 +784,29 @@ def verify_explanation_arithmetic(q_data):
     return True, ''
 
 
-def _answer_in_question_is_ok(question, answer, choices):
+# "What is 86 - 43?" — answer naturally appears in the expression
+_WHAT_IS_MATH_RE = re.compile(r'what is\s+[\d\s+\-*/×÷.]+')
+# "Which is bigger: 2/5 or 4/5?" — answer is one of the compared values
+_WHICH_IS_COMPARISON_RE = re.compile(r'which is (?:bigger|larger|smaller|greater|less)')
+
+
+def _answer_in_question_is_ok(question, q_lower, a_lower):
     """Check if answer appearing in question is an expected pattern.
 
     Math expressions, comparisons, and classification questions
     naturally contain the answer in the question text.
-    answer should already be stripped of MCQ letter prefix.
+    q_lower and a_lower are the lowercased question and answer; the answer
+    should already be stripped of MCQ letter prefix and whitespace.
     """
-    q_lower = question.lower()
-    a_lower = answer.lower().strip()
-
     if a_lower not in q_lower:
         return True  # answer not in question, no issue
 
     # Math expressions: "What is 86 - 43?" answer="43" is fine
-    if re.search(r'what is\s+[\d\s+\-*/×÷.]+', q_lower):
+    if _WHAT_IS_MATH_RE.search(q_lower):
         return True
 
     # Comparison: "Which is bigger: 2/5 or 4/5?" answer="4/5"
-    if any(w in q_lower for w in ('which is bigger', 'which is larger',
-                                   'which is smaller', 'which is greater',
-                                   'which is less')):
+    if _WHICH_IS_COMPARISON_RE.search(q_lower):
         return True
 
     # Classification: "Is X a Y, Z, or W?" — answer naturally in choices
@@ -633,16 +823,16 @@ def _answer_in_question_is_ok(question, answer, choices):
     if q_lower.startswith(('what ', 'which ')):
         # Allow ONLY if it's a specific identification pattern
         # "which is", "which of", "what is"
-        if any(pattern in q_lower for pattern in ('which is ', 'which of ', 'what is ')):
+        if 'which is ' in q_lower or 'which of ' in q_lower or 'what is ' in q_lower:
             return True
         # But NOT generic "which [expression]" patterns
-        if any(pattern in q_lower for pattern in ('which inequality', 'which equation',
-                                                     'which expression')):
+        if ('which inequality' in q_lower or 'which equation' in q_lower
+                or 'which expression' in q_lower):
             return False
         return True
 
     # Single character answers (letters, digits) are too common to flag
-    if len(answer) <= 1:
+    if len(a_lower) <= 1:
         return True
 
     return False
@@ -663,7 +853,7 @@ def _check_multiple_correct_answers(question, answer, choices):
     Returns (is_valid, reason).
     """
     q_lower = question.lower()
-    answer_text = LETTER_PREFIX_RE.sub('', answer).strip()
+    answer_text = _strip_letter_prefix(answer).strip()
 
     # Extract all numbers mentioned in the question using regex
     # Look for sequences like "24, 37, 48" or "13, 24, 37"
@@ -701,9 +891,11 @@ def _check_multiple_correct_answers(question, answer, choices):
     # For "odd" questions: count odd numbers
     # For "divisible by X" questions: count numbers divisible by X
 
-    if any(word in q_lower for word in ['even']):
+    is_even = 'even' in q_lower
+    is_odd = 'odd' in q_lower
+    if is_even:
         matching_count = sum(1 for n in numbers_in_question if n % 2 == 0)
-    elif any(word in q_lower for word in ['odd']):
+    elif is_odd:
         matching_count = sum(1 for n in numbers_in_question if n % 2 == 1)
     elif 'prime' in q_lower:
         # Simplified prime check
@@ -731,8 +923,7 @@ def _check_multiple_correct_answers(question, answer, choices):
     if matching_count > 1:
         matching_numbers = [
             n for n in numbers_in_question
-            if (any(word in q_lower for word in ['even']) and n % 2 == 0) or
-               (any(word in q_lower for word in ['odd']) and n % 2 == 1)
+            if (is_even and n % 2 == 0) or (is_odd and n % 2 == 1)
         ]
         return False, (
             f'Rule 19: Multiple correct answers in context. '
@@ -767,7 +958,7 @@ def verify_distractor_quality(q_data):
         return True, ''
 
     # Strip letter prefixes from answer
-    answer_text = LETTER_PREFIX_RE.sub('', answer).strip()
+    answer_text = _strip_letter_prefix(answer).strip()
 
     # Known fallback values that indicate poor distractor generation
     FALLBACK_SET = {
@@ -779,10 +970,12 @@ def verify_distractor_quality(q_data):
     fallback_count = sum(1 for opt in choices if opt.strip() in FALLBACK_SET)
 
     # Allow fallbacks if this is explicitly a boolean question
-    is_boolean_question = any(phrase in question.lower() for phrase in [
-        'true or false', 'is it true', 'is it false', 'yes or no',
-        'true/false', 'yes/no'
-    ])
+    q_lower = question.lower()
+    is_boolean_question = (
+        'true or false' in q_lower or 'is it true' in q_lower
+        or 'is it false' in q_lower or 'yes or no' in q_lower
+        or 'true/false' in q_lower or 'yes/no' in q_lower
+    )
     if is_boolean_question and fallback_count <= 2:
         return True, ''
 
@@ -798,7 +991,10 @@ def verify_distractor_quality(q_data):
     has_arabic = bool(re.search(r'[\u0600-\u06FF]', answer_text))
     has_chinese = bool(re.search(r'[\u4e00-\u9fff]', answer_text))
     has_latex = bool(re.search(r'\\[a-z]+\{', answer_text))
-    has_math_symbols = any(s in answer_text for s in ['≥', '≤', '÷', '×', '∑', '∫'])
+    has_math_symbols = (
+        '≥' in answer_text or '≤' in answer_text or '÷' in answer_text
+        or '×' in answer_text or '∑' in answer_text or '∫' in answer_text
+    )
 
     if (has_hebrew or has_arabic or has_chinese or has_latex or has_math_symbols) and fallback_count > 0:
         return False, (
@@ -830,16 +1026,17 @@ DRAW_IMPERATIVE_PATTERNS = [
 ]
 
 
-def _check_visual_descriptions(question, choices):
-    """Rule 16: Reject questions/options that describe visuals in text."""
-    q_lower = question.lower()
+def _check_visual_descriptions(q_lower, choice_lowers):
+    """Rule 16: Reject questions/options that describe visuals in text.
+
+    Takes the lowercased question and choices.
+    """
     for pattern in VISUAL_DESCRIPTION_PATTERNS:
         if pattern in q_lower:
             return False, f'Question describes visual in text: "{pattern}"'
 
     # Also check MCQ options — text descriptions of diagrams as choices
-    for choice in choices:
-        c_lower = choice.lower()
+    for c_lower in choice_lowers:
         for pattern in VISUAL_DESCRIPTION_PATTERNS:
             if pattern in c_lower:
                 return False, f'Choice describes visual in text: "{pattern}"'
@@ -847,9 +1044,11 @@ def _check_visual_descriptions(question, choices):
     return True, ''
 
 
-def _check_draw_imperatives(question):
-    """Rule 17: Reject questions asking students to graph/draw/sketch/plot."""
-    q_lower = question.lower()
+def _check_draw_imperatives(q_lower):
+    """Rule 17: Reject questions asking students to graph/draw/sketch/plot.
+
+    Takes the lowercased question.
+    """
     for pattern in DRAW_IMPERATIVE_PATTERNS:
         if pattern in q_lower:
             return False, f'Question asks student to produce visual: "{pattern}"'
@@ -1,6 +1,7 @@
 """Process student answers: grade, update ELO, log attempt."""
 import logging
 
+from db.database import transaction
 from models import student_skill as skill_model
 from models import attempt as attempt_model
 from engine import elo
@@ -65,33 +66,35 @@ def process_answer(student, current_question, student_answer,
     recent_accuracy = sum(recent_results) / len(recent_results)
     mastery = elo.compute_mastery(new_rating, recent_accuracy)
 
-    # Persist skill update
-    skill_model.upsert(
-        student_id, node_id, new_rating, new_uncertainty, mastery,
-        skill['total_attempts'] + 1,
-        skill['correct_attempts'] + (1 if is_correct else 0),
-    )
+    # Skill, attempt and history rows are written in one commit
+    with transaction():
+        # Persist skill update
+        skill_model.upsert(
+            student_id, node_id, new_rating, new_uncertainty, mastery,
+            skill['total_attempts'] + 1,
+            skill['correct_attempts'] + (1 if is_correct else 0),
+        )
 
-    # Record attempt with skill snapshots
-    before_rating = skill['skill_rating']
-    attempt_id = attempt_model.create(
-        question_id=current_question['question_id'],
-        student_id=student_id,
-        session_id=session_id,
-        answer_given=student_answer,
-        is_correct=1 if is_correct else 0,
-        partial_score=partial_score,
-        response_time_seconds=response_time_s,
-        curriculum_node_id=node_id,
-        skill_rating_before=round(before_rating, 1),
-        skill_rating_after=round(new_rating, 1),
-    )
+        # Record attempt with skill snapshots
+        before_rating = skill['skill_rating']
+        attempt_id = attempt_model.create(
+            question_id=current_question['question_id'],
+            student_id=student_id,
+            session_id=session_id,
+            answer_given=student_answer,
+            is_correct=1 if is_correct else 0,
+            partial_score=partial_score,
+            response_time_seconds=response_time_s,
+            curriculum_node_id=node_id,
+            skill_rating_before=round(before_rating, 1),
+            skill_rating_after=round(new_rating, 1),
+        )
 
-    # Record skill history for rating-over-time tracking
-    skill_model.record_history(
-        student_id, node_id, new_rating, new_uncertainty, mastery,
-        attempt_id=attempt_id,
-    )
+        # Record skill history for rating-over-time tracking
+        skill_model.record_history(
+            student_id, node_id, new_rating, new_uncertainty, mastery,
+            attempt_id=attempt_id,
+        )
 
     return {
         'is_correct': is_correct,
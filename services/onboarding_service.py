@@ -2,6 +2,7 @@
 import json
 import logging
 
+from db.database import transaction
 from models import student as student_model
 from models import topic as topic_model
 from models import curriculum_node as node_model
@@ -30,26 +31,28 @@ def onboard(student_name, topic_name):
         if not nodes_data:
             raise ValueError(f'Ollama returned no curriculum nodes for "{topic_name}"')
 
-        tid = topic_model.create(topic_name, description)
-        topic = topic_model.get_by_id(tid)
-
-        # Create curriculum nodes, resolving prerequisite names to IDs
-        created_ids = []
-        for node in nodes_data:
-            prereq_ids = [
-                created_ids[i]
-                for i in node.get('prerequisite_indices', [])
-                if i < len(created_ids)
-            ]
-            nid = node_model.create(
-                topic_id=tid,
-                name=node['name'],
-                description=node.get('description', ''),
-                order_index=node.get('order_index', 0),
-                prerequisites=json.dumps(prereq_ids),
-                mastery_threshold=node.get('mastery_threshold', 0.75),
-            )
-            created_ids.append(nid)
+        # Topic and all its nodes are committed together
+        with transaction():
+            tid = topic_model.create(topic_name, description)
+            topic = topic_model.get_by_id(tid)
+
+            # Create curriculum nodes, resolving prerequisite names to IDs
+            created_ids = []
+            for node in nodes_data:
+                prereq_ids = [
+                    created_ids[i]
+                    for i in node.get('prerequisite_indices', [])
+                    if i < len(created_ids)
+                ]
+                nid = node_model.create(
+                    topic_id=tid,
+                    name=node['name'],
+                    description=node.get('description', ''),
+                    order_index=node.get('order_index', 0),
+                    prerequisites=json.dumps(prereq_ids),
+                    mastery_threshold=node.get('mastery_threshold', 0.75),
+                )
+                created_ids.append(nid)
 
         logger.info('Created curriculum for "%s": %d nodes via %s',
                      topic_name, len(created_ids), model)
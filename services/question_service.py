@@ -2,6 +2,7 @@
 import json
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from flask import session as flask_session
 
@@ -24,7 +25,7 @@ from ai import question_generator
 from ai.distractors import insert_distractors
 from ai.local_generators import (is_clock_node, generate_clock_question,
                                  is_inequality_node, generate_inequality_question)
-from config.settings import SESSION_DEFAULTS
+from config.settings import OLLAMA_NUM_PARALLEL, SESSION_DEFAULTS
 
 logger = logging.getLogger(__name__)
 
@@ -100,14 +101,22 @@ def precache_next(session_id, student, topic_id, current_question=None):
     logger.info('Pre-caching dual: current=%.0f, if_correct=%.0f, if_wrong=%.0f',
                 skill_rating, rating_correct, rating_wrong)
 
-    # Generate question for each outcome with predicted skill overrides
-    result = {}
-    for outcome, predicted_rating in [('correct', rating_correct), ('wrong', rating_wrong)]:
-        overrides = {node_id: predicted_rating}
-        q = generate_next(session_id, student, topic_id,
-                          store_in_session=False, skill_overrides=overrides,
-                          last_was_correct=(outcome == 'correct'))
-        result[outcome] = q
+    # Generate question for each outcome with predicted skill overrides.
+    # The two paths are independent, so they go to Ollama concurrently.
+    def generate_for(outcome, predicted_rating):
+        return generate_next(session_id, student, topic_id,
+                             store_in_session=False,
+                             skill_overrides={node_id: predicted_rating},
+                             last_was_correct=(outcome == 'correct'))
+
+    outcomes = [('correct', rating_correct), ('wrong', rating_wrong)]
+    workers = max(1, min(OLLAMA_NUM_PARALLEL, len(outcomes)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [(outcome, pool.submit(generate_for, outcome, rating))
+                   for outcome, rating in outcomes]
+        result = {outcome: future.result() for outcome, future in futures}
+
+    for outcome, q in result.items():
         if q:
             logger.info('Pre-cached %s-path question (diff=%.0f, node=%s)',
                         outcome, q.get('difficulty', 0), q.get('node_name'))
@@ -219,7 +228,7 @@ def generate_next(session_id, student, topic_id, store_in_session=True,
 
     if is_clock_node(focus_node['name'], node_desc):
         q_data, model, prompt = generate_clock_question(
-            focus_node['name'], node_desc, recent_text_list
+            focus_node['name'], node_desc, all_exclude
         )
         if q_data:
             q_type = QUESTION_TYPE_MCQ
@@ -227,7 +236,7 @@ def generate_next(session_id, student, topic_id, store_in_session=True,
 
     if not q_data and is_inequality_node(focus_node['name'], node_desc):
         q_data, model, prompt = generate_inequality_question(
-            focus_node['name'], node_desc, recent_text_list
+            focus_node['name'], node_desc, all_exclude
         )
         if q_data:
             q_type = QUESTION_TYPE_MCQ
@@ -235,16 +244,19 @@ def generate_next(session_id, student, topic_id, store_in_session=True,
 
     # --- Generate with validation + dedup retry (LLM path) ---
     if not q_data:
+        topic_name = topic['name'] if topic else ''
         for attempt_num in range(SESSION_DEFAULTS['max_generation_attempts']):
             try:
                 q_data, model, prompt = question_generator.generate(
                     focus_node['name'],
                     node_desc,
-                    topic['name'] if topic else '',
+                    topic_name,
                     node_desc,
                     target_diff,
                     q_type,
                     recent_text_list,
+                    # After a rejection, don't get the same cached question back
+                    use_cache=(attempt_num == 0),
                 )
             except Exception as e:
                 logger.warning('Generation attempt %d failed: %s', attempt_num + 1, e)
@@ -262,6 +274,10 @@ def generate_next(session_id, student, topic_id, store_in_session=True,
                 q_data = None
                 continue
 
+            # Untouched copy for the question cache, taken before validation
+            # adds placeholder options
+            generated = dict(q_data)
+
             # Validate the generated question
             # For MCQ, add placeholder options for validation (will be replaced with computed distractors)
             if q_type == QUESTION_TYPE_MCQ and q_data and not q_data.get('options'):
@@ -296,7 +312,8 @@ def generate_next(session_id, student, topic_id, store_in_session=True,
             # Layer 3: Similarity check against correctly-answered questions
             # Avoid similar follow-up questions after correct answers (e.g., don't ask "5+3" then "5+2")
             is_similar, similar_to, similarity_score = is_similar_to_any(
-                q_text, list(global_correct_texts), threshold=SIMILARITY_THRESHOLD
+                q_text, global_correct_texts, threshold=SIMILARITY_THRESHOLD,
+                first_match=True,
             )
             if is_similar:
                 logger.warning('Similarity dedup rejected (attempt %d, score=%.2f)',
@@ -304,6 +321,12 @@ def generate_next(session_id, student, topic_id, store_in_session=True,
                 q_data = None
                 continue
 
+            # Only questions that passed every check are offered for reuse
+            question_generator.cache_question(
+                focus_node['name'], node_desc, topic_name, target_diff, q_type,
+                generated, model, prompt,
+            )
+
             # Compute distractors for MCQ (after validation, before storing)
             if q_type == QUESTION_TYPE_MCQ and q_data:
                 q_data, success, reason = insert_distractors(q_data)
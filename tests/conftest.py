@@ -11,7 +11,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 @pytest.fixture(autouse=True)
 def temp_db(monkeypatch, tmp_path):
-    """Redirect DB_PATH to a temp file for every test."""
+    """Redirect DB_PATH (and the prompt cache) to temp files for every test."""
     db_path = str(tmp_path / 'test_mora.db')
     monkeypatch.setattr('config.settings.DB_PATH', db_path)
 
@@ -19,6 +19,18 @@ def temp_db(monkeypatch, tmp_path):
     import db.database as db_mod
     monkeypatch.setattr(db_mod, 'DB_PATH', db_path)
 
+    # Keep the Ollama prompt cache out of the project directory
+    monkeypatch.setattr('ai.prompt_cache.PROMPT_CACHE_PATH',
+                        str(tmp_path / 'test_prompt_cache.db'))
+
+    # Generated questions must not leak between tests
+    from ai.question_generator import clear_question_cache
+    clear_question_cache()
+
+    # Nor may pooled Ollama connections (tests fake them)
+    from ai.ollama_client import close_connections
+    close_connections()
+
     from db.database import init_db
     init_db()
 
@@ -89,6 +89,14 @@ def test_get_subject_prompt_default():
     assert prompt == DEFAULT_PROMPT
 
 
+def test_get_subject_prompt_priority():
+    """An earlier subject wins even when a later one matches first in the text."""
+    from ai.question_generator import get_subject_prompt, HEBREW_PROMPT, MATH_PROMPT
+
+    assert get_subject_prompt("Math Facts", "Counting in Hebrew") == HEBREW_PROMPT
+    assert get_subject_prompt("Reading", "Number words") == MATH_PROMPT
+
+
 # ============================================================================
 # Hebrew Question Quality Tests
 # ============================================================================
@@ -262,7 +270,7 @@ def test_no_multiple_blanks():
 # Integration Tests - Mock LLM Generation
 # ============================================================================
 
-@patch('ai.question_generator.ask')
+@patch('ai.question_generator.ask_until_json_closes')
 def test_generate_hebrew_question(mock_ask):
     """Test generating a Hebrew question uses correct prompt."""
     from ai.question_generator import generate, HEBREW_PROMPT
@@ -288,7 +296,7 @@ def test_generate_hebrew_question(mock_ask):
     assert HEBREW_PROMPT in call_args[0][0]
 
 
-@patch('ai.question_generator.ask')
+@patch('ai.question_generator.ask_until_json_closes')
 def test_generate_math_question(mock_ask):
     """Test generating a math question uses correct prompt."""
     from ai.question_generator import generate, MATH_PROMPT
@@ -314,7 +322,7 @@ def test_generate_math_question(mock_ask):
     assert MATH_PROMPT in call_args[0][0]
 
 
-@patch('ai.question_generator.ask')
+@patch('ai.question_generator.ask_until_json_closes')
 def test_generate_reading_question(mock_ask):
     """Test generating a reading question uses correct prompt."""
     from ai.question_generator import generate, READING_PROMPT
@@ -340,6 +348,75 @@ def test_generate_reading_question(mock_ask):
     assert READING_PROMPT in call_args[0][0]
 
 
+@patch('ai.question_generator.ask_until_json_closes')
+def test_generate_retries_truncated_response(mock_ask):
+    """A response cut off mid-JSON is re-asked once with a bigger budget."""
+    from ai.question_generator import generate
+    from config.settings import QUESTION_MAX_TOKENS, QUESTION_RETRY_MAX_TOKENS
+
+    mock_ask.side_effect = [
+        ('{"question": "What is 3 + 4?", "correct_answer": "7", "explan', 'm', 'p'),
+        ('{"question": "What is 3 + 4?", "correct_answer": "7"}', 'm', 'p'),
+    ]
+    q_data, _, _ = generate('Addition', 'Basic addition', 'Math (K-4)', 'Addition to 10',
+                            500, 'mcq')
+
+    assert q_data['correct_answer'] == '7'
+    budgets = [c.kwargs['max_tokens'] for c in mock_ask.call_args_list]
+    assert budgets == [QUESTION_MAX_TOKENS, QUESTION_RETRY_MAX_TOKENS]
+
+
+@patch('ai.question_generator.ask_until_json_closes')
+def test_generate_no_retry_for_complete_json(mock_ask):
+    from ai.question_generator import generate
+
+    mock_ask.return_value = ('{"question": "What is 3 + 4?", "correct_answer": "7"}', 'm', 'p')
+    generate('Addition', 'Basic addition', 'Math (K-4)', 'Addition to 10', 500, 'mcq')
+    mock_ask.assert_called_once()
+
+
+@patch('ai.question_generator.ask_until_json_closes')
+def test_generate_reuses_cached_question(mock_ask):
+    """Same node, type and difficulty bucket reuses the last cached question."""
+    from ai.question_generator import cache_question, generate
+
+    mock_ask.return_value = ('{"question": "What is 3 + 4?", "correct_answer": "7"}', 'm', 'p')
+    first, model, prompt = generate('Addition', 'Basic addition', 'Math (K-4)', 'Addition to 10', 600, 'mcq')
+    cache_question('Addition', 'Basic addition', 'Math (K-4)', 600, 'mcq', first, model, prompt)
+    first['options'] = ['7', '8', '9', '6']  # Caller mutations don't leak into the cache
+    second, model, _ = generate('Addition', 'Basic addition', 'Math (K-4)', 'Addition to 10', 604, 'mcq')
+
+    mock_ask.assert_called_once()
+    assert second == {'question': 'What is 3 + 4?', 'correct_answer': '7'}
+    assert model == 'm'
+
+
+@patch('ai.question_generator.ask_until_json_closes')
+def test_generate_cache_skips_recent_and_other_buckets(mock_ask):
+    from ai.question_generator import cache_question, generate
+
+    mock_ask.return_value = ('{"question": "What is 3 + 4?", "correct_answer": "7"}', 'm', 'p')
+    args = ('Addition', 'Basic addition', 'Math (K-4)', 'Addition to 10')
+    q_data, model, prompt = generate(*args, 500, 'mcq')
+    cache_question('Addition', 'Basic addition', 'Math (K-4)', 500, 'mcq', q_data, model, prompt)
+    generate(*args, 500, 'mcq', ['What is 3 + 4?'])  # Already seen by this student
+    generate(*args, 900, 'mcq')                      # Different difficulty bucket
+    generate(*args, 500, 'mcq', use_cache=False)
+    assert mock_ask.call_count == 4
+
+
+@patch('ai.question_generator.ask_until_json_closes')
+def test_generate_does_not_cache_unvalidated_question(mock_ask):
+    """Only cache_question() fills the cache, so a rejected question isn't reused."""
+    from ai.question_generator import generate
+
+    mock_ask.return_value = ('{"question": "What is 3 + 4?", "correct_answer": "8"}', 'm', 'p')
+    args = ('Addition', 'Basic addition', 'Math (K-4)', 'Addition to 10')
+    generate(*args, 500, 'mcq')
+    generate(*args, 500, 'mcq')
+    assert mock_ask.call_count == 2
+
+
 # ============================================================================
 # Curriculum Node Tests
 # ============================================================================
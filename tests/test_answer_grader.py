@@ -1,6 +1,6 @@
 """Tests for ai/answer_grader.py — mocking Ollama."""
 from unittest.mock import patch
-from ai.answer_grader import grade
+from ai.answer_grader import grade, grade_many, grade_batch
 
 
 def _mock_ask(system, user, **kwargs):
@@ -99,3 +99,66 @@ def test_prompt_includes_question(mock):
     call_args = mock.call_args[0]
     assert 'What is 2+2?' in call_args[1]
     assert 'Arithmetic' in call_args[1]
+
+
+def _mock_ask_echo(system, user, **kwargs):
+    """Mark the answer correct only when the student wrote 'right'."""
+    ok = 'Student answer: right' in user
+    return (
+        f'{{"is_correct": {"true" if ok else "false"}, "feedback": "{user.splitlines()[0]}"}}',
+        'test-model',
+        user,
+    )
+
+
+@patch('ai.ollama_client.ask', side_effect=_mock_ask_echo)
+def test_grade_many_preserves_order(mock):
+    items = [(f'Q{i}?', 'A', 'right' if i % 2 == 0 else 'wrong', 'Math')
+             for i in range(6)]
+    results = grade_many(items)
+    assert len(results) == 6
+    assert mock.call_count == 6
+    for i, (is_correct, score, feedback, model, _) in enumerate(results):
+        assert is_correct is (i % 2 == 0)
+        assert score == (1.0 if i % 2 == 0 else 0.0)
+        assert feedback == f'Question: Q{i}?'
+        assert model == 'test-model'
+
+
+@patch('ai.ollama_client.ask', side_effect=_mock_ask_echo)
+def test_grade_many_empty(mock):
+    assert grade_many([]) == []
+    assert mock.call_count == 0
+
+
+def _mock_ask_batch(system, user, **kwargs):
+    """Return verdicts out of order, and skip item 3 when present."""
+    n = user.count('Student answer:')
+    if n == 1:
+        return _mock_ask(system, user, **kwargs)
+    verdicts = [
+        f'{{"index": {i}, "is_correct": {"true" if i % 2 else "false"}, "feedback": "item {i}"}}'
+        for i in range(n, 0, -1) if i != 3
+    ]
+    return '[' + ', '.join(verdicts) + ']', 'test-model', user
+
+
+@patch('ai.answer_grader.ask', side_effect=_mock_ask_batch)
+def test_grade_batch_single_call_sorted_by_index(mock):
+    items = [('Q?', 'A', 'B', 'Math')] * 2
+    results = grade_batch(items, batch_size=8)
+    assert mock.call_count == 1
+    assert [r[0] for r in results] == [True, False]
+    assert [r[2] for r in results] == ['item 1', 'item 2']
+    assert results[1][1] == 0.0
+
+
+@patch('ai.answer_grader.ask', side_effect=_mock_ask_batch)
+def test_grade_batch_chunks_and_regrades_missing(mock):
+    items = [('Q?', 'A', 'B', 'Math')] * 5
+    results = grade_batch(items, batch_size=4)
+    # chunk of 4 (item 3 missing → 1 single call) + chunk of 1
+    assert mock.call_count == 3
+    assert len(results) == 5
+    assert results[2][2] == 'Perfect!'
+    assert mock.call_args_list[0][1]['max_tokens'] == 256 * 4
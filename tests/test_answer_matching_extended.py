@@ -74,8 +74,24 @@ def test_numeric_close():
     assert is_close is True
 
 
+def test_text_close_by_character_overlap():
+    """Most of the correct answer's distinct letters present -> close."""
+    assert check_answer('mitochondria', 'mitochondrion') == (False, True)
+    assert check_answer('jupiter', 'mars') == (False, False)
+
+
 def test_numeric_far():
     """200 vs 100 = not close."""
     correct, is_close = check_answer('200', '100')
     assert correct is False
     assert is_close is False
+
+
+def test_numeric_fast_path_commas_and_decimals():
+    assert check_answer('1,000', '1000') == (True, False)
+    assert check_answer(' 7.0 ', '7') == (True, False)
+
+
+def test_non_finite_numbers_use_text_match():
+    assert check_answer('nan', 'nan') == (True, False)
+    assert check_answer('inf', '7')[0] is False
@@ -56,3 +56,36 @@ def test_foreign_keys_enabled(temp_db):
         assert result[0] == 1
     finally:
         conn.close()
+
+
+def test_synchronous_normal(temp_db):
+    """WAL databases run with synchronous=NORMAL (1)."""
+    from db.database import get_db
+    conn = get_db()
+    try:
+        assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1
+    finally:
+        conn.close()
+
+
+def test_query_db_reuses_thread_connection(temp_db):
+    """query_db/execute_db share one connection per thread until close_db."""
+    from db import database
+    database.execute_db("INSERT INTO students (name) VALUES (?)", ('Reuse',))
+    conn = database._local.conn
+    assert database.query_db("SELECT name FROM students", one=True)['name'] == 'Reuse'
+    assert database._local.conn is conn
+
+    database.close_db()
+    assert database._local.conn is None
+    assert database.query_db("SELECT COUNT(*) AS n FROM students", one=True)['n'] == 1
+
+
+def test_request_logging_skips_static(client, caplog):
+    """Page requests are logged; static files are not."""
+    with caplog.at_level('INFO', logger='mora.requests'):
+        client.get('/')
+        client.get('/static/css/style.css')
+    lines = [r.getMessage() for r in caplog.records if r.name == 'mora.requests']
+    assert any(line.startswith('>>> GET /') for line in lines)
+    assert not any('/static/' in line for line in lines)
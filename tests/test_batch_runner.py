@@ -0,0 +1,48 @@
+"""Tests for ai/batch_runner.py — mocking ollama_client.ask."""
+from unittest.mock import patch
+
+from ai import ollama_client
+from ai.batch_runner import Job, run_jobs
+from config.settings import OLLAMA_MODEL
+
+
+def _mock_ask(system, user, model=None, **kwargs):
+    return (f'{model}:{user}', model or 'default', f'SYSTEM: {system}\nUSER: {user}')
+
+
+@patch('ai.ollama_client.ask', side_effect=_mock_ask)
+def test_results_in_input_order(mock):
+    jobs = [Job('s', 'u1', 'b'), Job('s', 'u2', 'a'), Job('s', 'u3', 'b'), Job('s', 'u4')]
+    texts = [r[0] for r in run_jobs(jobs)]
+    assert texts == ['b:u1', 'a:u2', 'b:u3', f'{OLLAMA_MODEL}:u4']
+
+
+@patch('ai.ollama_client.ask', side_effect=_mock_ask)
+def test_dispatch_grouped_by_model(mock):
+    jobs = [Job('s', 'u1', 'b'), Job('s', 'u2', 'a'), Job('s', 'u3', 'b'), Job('s', 'u4', 'a')]
+    run_jobs(jobs)
+    models = [c.kwargs['model'] for c in mock.call_args_list]
+    # Each model's calls are contiguous: a single switch from one to the other
+    switches = sum(1 for x, y in zip(models, models[1:]) if x != y)
+    assert sorted(models) == ['a', 'a', 'b', 'b']
+    assert switches == 1
+
+
+@patch('ai.ollama_client.ask', side_effect=_mock_ask)
+def test_kwargs_passed_through(mock):
+    run_jobs([Job('s', 'u', kwargs={'temperature': 0.1, 'max_tokens': 64})])
+    assert mock.call_args.kwargs['temperature'] == 0.1
+    assert mock.call_args.kwargs['max_tokens'] == 64
+
+
+@patch('ai.ollama_client.ask_many', wraps=ollama_client.ask_many)
+@patch('ai.ollama_client.ask', side_effect=_mock_ask)
+def test_groups_dispatched_through_ask_many(mock, mock_many):
+    jobs = [Job('s', 'u1', 'b'), Job('s', 'u2', 'a'), Job('s', 'u3', 'b')]
+    run_jobs(jobs)
+    calls = [(c.args[1], c.kwargs['model']) for c in mock_many.call_args_list]
+    assert calls == [(['u2'], 'a'), (['u1', 'u3'], 'b')]
+
+
+def test_empty():
+    assert run_jobs([]) == []
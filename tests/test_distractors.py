@@ -42,6 +42,25 @@ class TestNumericDistractors:
         assert any(d in distractors for d in ['9', '11', '8', '12'])
 
 
+class TestFormatNumber:
+    def test_integer(self):
+        assert _format_number(2.0, False) == '2'
+        assert _format_number(7, True) == '7'
+
+    def test_trailing_zeros_dropped(self):
+        assert _format_number(1.5, False) == '1.5'
+        assert _format_number(1.50, False) == '1.5'
+        assert _format_number(0.1, False) == '0.1'
+
+    def test_rounds_to_two_places(self):
+        assert _format_number(2.0 / 3, False) == '0.67'
+        assert _format_number(1234.5, False) == '1234.5'
+        assert _format_number(0.001, False) == '0'
+
+    def test_no_negative_zero(self):
+        assert _format_number(-0.001, False) == '0'
+
+
 class TestComputeDistractors:
     def test_returns_list(self):
         result = compute_distractors('12')
@@ -1,6 +1,6 @@
 """Tests for ai/explainer.py — mocking Ollama."""
 from unittest.mock import patch
-from ai.explainer import explain
+from ai.explainer import explain, explain_many, explain_batch
 
 
 def _mock_ask_valid(system, user, **kwargs):
@@ -69,3 +69,32 @@ def test_prompt_includes_context(mock):
     call_args = mock.call_args[0]
     assert 'What is 2+2?' in call_args[1]
     assert 'Addition' in call_args[1]
+
+
+@patch('ai.ollama_client.ask', side_effect=_mock_ask_valid)
+def test_explain_many_returns_one_result_per_item(mock):
+    items = [('What is 2+2?', '4', '3', 'Addition', 'Math'),
+             ('What is 3+3?', '6', '5', 'Addition', 'Math')]
+    results = explain_many(items)
+    assert len(results) == 2
+    assert mock.call_count == 2
+    for result, model, prompt in results:
+        assert result['key_concept'] == 'Addition'
+        assert model == 'test-model'
+    assert 'What is 2+2?' in results[0][2]
+    assert 'What is 3+3?' in results[1][2]
+
+
+@patch('ai.explainer.ask')
+def test_explain_batch_one_call_per_chunk(mock):
+    mock.return_value = (
+        '[{"index": 2, "explanation": "second"}, {"index": 1, "explanation": "first"}]',
+        'test-model', 'prompt',
+    )
+    items = [('Q1?', '4', '3', 'Addition', 'Math'),
+             ('Q2?', '6', '5', 'Addition', 'Math')]
+    results = explain_batch(items)
+    assert mock.call_count == 1
+    assert [r[0]['explanation'] for r in results] == ['first', 'second']
+    assert 'index' not in results[0][0]
+    assert '[1] Question: Q1?' in mock.call_args[0][1]
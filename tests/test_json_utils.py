@@ -1,4 +1,6 @@
 """Tests for ai/json_utils.py."""
+import json
+
 import pytest
 from ai.json_utils import parse_ai_json
 
@@ -34,3 +36,96 @@ def test_invalid_json_raises():
 def test_array_json():
     result = parse_ai_json('[1, 2, 3]')
     assert result == [1, 2, 3]
+
+
+def test_repaired_parse_is_cached_and_not_shared():
+    from ai.json_utils import _parse_repaired
+    parse_ai_json.cache_clear()
+    text = 'Sure! {"items": [1, 2]} Hope that helps.'
+    first = parse_ai_json(text)
+    first['items'].append(3)
+    second = parse_ai_json(text)
+    assert second == {"items": [1, 2]}
+    info = _parse_repaired.cache_info()
+    assert info.hits == 1 and info.misses == 1
+
+
+def test_prose_without_brackets_fails_fast():
+    from ai.json_utils import _parse_repaired
+    parse_ai_json.cache_clear()
+    with pytest.raises(json.JSONDecodeError):
+        parse_ai_json("I'm sorry, I can't produce a question for that. " * 200)
+    assert _parse_repaired.cache_info().misses == 0
+
+
+def test_deeply_nested_object_with_trailing_prose():
+    text = ('Here you go: {"a": {"b": {"c": [1, {"d": "}"}]}}, "e": "x"} '
+            'Let me know if you need more {help}.')
+    assert parse_ai_json(text) == {"a": {"b": {"c": [1, {"d": "}"}]}}, "e": "x"}
+
+
+def test_array_preceding_prose_brackets():
+    text = 'Results: [{"index": 1}, {"index": 2}] (see [notes])'
+    assert parse_ai_json(text) == [{"index": 1}, {"index": 2}]
+
+
+def test_skips_unclosed_leading_brace():
+    text = 'Format {like this, then: {"key": "value"}'
+    assert parse_ai_json(text) == {"key": "value"}
+
+
+def test_extract_span_ignores_brackets_in_strings():
+    from ai.json_utils import _extract_json_span
+    text = 'x {"q": "a \\"}\\" b", "r": [1]} y'
+    assert _extract_json_span(text, 2) == '{"q": "a \\"}\\" b", "r": [1]}'
+    assert _extract_json_span('{"open": 1', 0) is None
+
+
+def test_close_tracker_across_chunks():
+    from ai.json_utils import JsonCloseTracker
+    tracker = JsonCloseTracker()
+    chunks = ['Sure! "quoted" ', '```json\n{"a": "x}', '\\"}", "b": [1, ', '2]', '}', '\n```']
+    closed_at = [tracker.feed(c) for c in chunks]
+    assert closed_at == [False, False, False, False, True, True]
+
+
+def test_close_tracker_never_started():
+    from ai.json_utils import JsonCloseTracker
+    tracker = JsonCloseTracker()
+    assert tracker.feed('no json here }') is False
+    assert tracker.started is False
+
+
+def test_fast_loads_matches_stdlib():
+    import math
+    from ai.json_utils import fast_loads
+    assert fast_loads(b'{"a": [1, 2.5, "\\u00e9"]}') == {"a": [1, 2.5, "é"]}
+    assert math.isnan(fast_loads('NaN'))           # stdlib-only extension
+    with pytest.raises(json.JSONDecodeError):
+        fast_loads('not json')
+
+
+def test_without_orjson(monkeypatch):
+    from ai import json_utils
+    monkeypatch.setattr(json_utils, 'orjson', None)
+    assert json_utils.fast_loads('{"a": 1}') == {"a": 1}
+    assert json.loads(json_utils.fast_dumps({"q": "א"})) == {"q": "א"}
+
+
+def test_parse_keeps_big_ints_exact():
+    assert parse_ai_json('{"n": 123456789012345678901234567890}') == {"n": 123456789012345678901234567890}
+
+
+def test_parse_trailing_commas():
+    assert parse_ai_json('{"question": "2+2?", "correct_answer": "4",}') == \
+        {"question": "2+2?", "correct_answer": "4"}
+    assert parse_ai_json('```json\n{"a": [1, 2,],}\n```') == {"a": [1, 2]}
+
+
+def test_parse_comma_inside_string_untouched():
+    assert parse_ai_json('{"a": "x,]"}') == {"a": "x,]"}
+
+
+def test_parse_long_digit_runs_stay_exact():
+    assert parse_ai_json('[-9223372036854775809]') == [-9223372036854775809]
+    assert parse_ai_json('{"n": 999999999999999999}') == {"n": 999999999999999999}
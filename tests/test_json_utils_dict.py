@@ -102,3 +102,32 @@ def test_fix_escapes_preserves_backslash():
     fixed = _fix_latex_escapes(raw)
     result = parse_ai_json(fixed)
     assert 'path' in result['key']
+
+
+def test_fix_escapes_exact_output():
+    r"""Lone backslashes doubled; \\ pairs, \" and a trailing \ untouched."""
+    cases = {
+        r'\(': r'\\(',
+        r'\sqrt{16}': r'\\sqrt{16}',
+        r'3 \times 4': r'3 \\times 4',
+        r'a\\b': r'a\\b',
+        r'say \"hi\"': r'say \"hi\"',
+        r'\\\(': r'\\\\(',
+        'end\\': 'end\\',
+    }
+    for raw, expected in cases.items():
+        assert _fix_latex_escapes(raw) == expected
+
+
+def test_batch_maps_by_index():
+    from ai.json_utils import parse_ai_json_batch
+    text = '[{"index": 2, "v": "b"}, {"index": 1, "v": "a"}, {"index": 9, "v": "x"}]'
+    assert parse_ai_json_batch(text, 2) == {1: {"index": 1, "v": "a"},
+                                            2: {"index": 2, "v": "b"}}
+
+
+def test_batch_falls_back_to_position():
+    from ai.json_utils import parse_ai_json_batch
+    assert parse_ai_json_batch('[{"v": "a"}, 7, {"v": "c"}]', 3) == {
+        1: {"v": "a"}, 3: {"v": "c"}}
+    assert parse_ai_json_batch('{"v": "only"}', 1) == {1: {"v": "only"}}
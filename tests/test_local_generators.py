@@ -1,7 +1,9 @@
 """Tests for ai/local_generators.py — clock + inequality generation."""
 from ai.local_generators import (
     is_clock_node, generate_clock_question, _format_clock_time,
+    _generate_clock_svg,
     is_inequality_node, generate_inequality_question,
+    _generate_number_line_svg,
 )
 
 
@@ -56,6 +58,12 @@ def test_svg_is_valid():
     assert '</svg>' in q_data['clock_svg']
 
 
+def test_clock_svg_memoized():
+    """Same time and size returns the cached string."""
+    assert _generate_clock_svg(3, 15) is _generate_clock_svg(3, 15)
+    assert _generate_clock_svg(3, 15) != _generate_clock_svg(3, 30)
+
+
 def test_hour_only_node():
     """Hour-only nodes should produce :00 times."""
     q_data, _, _ = generate_clock_question('Telling Time to the Hour')
@@ -77,6 +85,14 @@ def test_avoids_recent_questions():
     assert q_data['correct_answer'] == '12:00'
 
 
+def test_all_recent_still_generates():
+    """When every time was asked recently, any time is acceptable."""
+    recent = [f"What time does this clock show? [{h}:00]" for h in range(1, 13)]
+    q_data, _, _ = generate_clock_question('Telling Time to the Hour', recent_questions=recent)
+    assert q_data['correct_answer'].endswith(':00')
+    assert q_data['correct_answer'] in q_data['options']
+
+
 # --- _format_clock_time ---
 
 def test_format_hour():
@@ -152,6 +168,13 @@ def test_ineq_svg_has_tick_labels():
     assert '>0<' in svg  # zero label
 
 
+def test_number_line_svg_memoized():
+    """Same inequality returns the cached string; circle reflects inclusivity."""
+    assert _generate_number_line_svg('>', 2) is _generate_number_line_svg('>', 2)
+    assert 'fill="white"' in _generate_number_line_svg('>', 2)
+    assert 'fill="white"' not in _generate_number_line_svg('>=', 2)
+
+
 def test_ineq_options_are_expressions():
     """Options should be inequality expressions, not text descriptions."""
     q_data, _, _ = generate_inequality_question('Solving Inequalities')
@@ -169,3 +192,22 @@ def test_ineq_avoids_recent():
     q_data, _, _ = generate_inequality_question('Inequalities', recent_questions=recent)
     # Should still generate something (boundary=5 with some operator)
     assert q_data is not None
+
+
+def test_ineq_explanation_wording():
+    """Explanation matches the operator's circle type and direction."""
+    for op, fragments in {
+        '>=': ('filled circle at 2', 'value 2 is included', 'to the right',
+               'greater than or equal to 2.'),
+        '<': ('open circle at 2', 'value 2 is not included', 'to the left',
+              'less than 2.'),
+    }.items():
+        recent = [
+            f"Which inequality does this number line represent? [x {o} {v}]"
+            for o in ['>', '<', '>=', '<='] for v in range(-5, 6)
+            if (o, v) != (op, 2)
+        ]
+        q_data, _, _ = generate_inequality_question('Inequalities', recent_questions=recent)
+        assert (q_data['inequality_op'], q_data['inequality_boundary']) == (op, 2)
+        for fragment in fragments:
+            assert fragment in q_data['explanation']
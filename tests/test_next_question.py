@@ -297,6 +297,17 @@ def test_eligible_no_prereqs_always_eligible():
     assert len(eligible) == 2
 
 
+def test_eligible_shared_prereq_and_node_map():
+    """Several nodes sharing a blocked prereq are all excluded; a passed-in
+    id map stands in for the node id set."""
+    nodes = [_make_node(1, 0), _make_node(2, 1, prerequisites=[1]),
+             _make_node(3, 2, prerequisites=[1]), _make_node(4, 3, prerequisites=[9])]
+    skills = {1: {'mastery_level': 0.1, 'skill_rating': 800, 'total_attempts': 1}}
+    nodes_by_id = {n['id']: n for n in nodes}
+    eligible = _get_eligible_nodes(nodes, skills, nodes_by_id)
+    assert [n['id'] for n in eligible] == [1, 4]  # 9 is outside the topic
+
+
 # === _find_weak_prerequisite ===
 
 def test_find_weak_prereq():
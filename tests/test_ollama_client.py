@@ -0,0 +1,169 @@
+"""Tests for ai/ollama_client.py — streaming helpers and keep-alive transport."""
+import http.client
+import io
+import json
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ai.ollama_client import ask, ask_stream, ask_until_json_closes
+
+
+def _ndjson(*pieces, model='test-model'):
+    """Fake a streaming /api/chat response body."""
+    lines = [json.dumps({'model': model, 'message': {'content': p}, 'done': False})
+             for p in pieces]
+    lines.append(json.dumps({'model': model, 'message': {'content': ''}, 'done': True}))
+    return io.BytesIO(('\n'.join(lines) + '\n').encode())
+
+
+def _opened(resp):
+    """Fake _open_chat's (response, pooled connection) return value."""
+    return resp, MagicMock(spec=http.client.HTTPConnection)
+
+
+def test_ask_stream_yields_fragments():
+    with patch('ai.ollama_client._open_chat',
+               return_value=_opened(_ndjson('Hel', 'lo'))):
+        assert list(ask_stream('sys', 'user')) == ['Hel', 'lo']
+
+
+def test_ask_stream_sends_stream_flag():
+    with patch('ai.ollama_client._open_chat',
+               return_value=_opened(_ndjson('x'))) as mock_open:
+        list(ask_stream('sys', 'user'))
+    body = mock_open.call_args[0][0]
+    assert body['stream'] is True
+
+
+def test_streaming_helpers_pass_model_through():
+    with patch('ai.ollama_client._open_chat',
+               side_effect=lambda payload: _opened(_ndjson('{}'))) as mock_open:
+        list(ask_stream('sys', 'user', model='other-model'))
+        ask_until_json_closes('sys', 'user', model='other-model')
+    assert [c[0][0]['model'] for c in mock_open.call_args_list] == ['other-model'] * 2
+
+
+def test_payload_keeps_model_resident_with_fixed_context():
+    from config.settings import OLLAMA_KEEP_ALIVE, OLLAMA_NUM_CTX
+    with patch('ai.ollama_client._open_chat',
+               return_value=_opened(_ndjson('x'))) as mock_open:
+        list(ask_stream('sys', 'user'))
+    body = mock_open.call_args[0][0]
+    assert body['keep_alive'] == OLLAMA_KEEP_ALIVE
+    assert body['options']['num_ctx'] == OLLAMA_NUM_CTX
+    assert body['messages'][0] == {'role': 'system', 'content': 'sys'}
+
+
+def test_ask_joins_stream():
+    with patch('ai.ollama_client._open_chat',
+               return_value=_opened(_ndjson('{"a"', ': 1}'))) as mock_open:
+        text, model, prompt = ask('sys', 'user')
+    assert text == '{"a": 1}'
+    assert model == 'test-model'
+    assert prompt == 'SYSTEM: sys\n\nUSER: user'
+    assert mock_open.call_args[0][0]['stream'] is True
+
+
+def test_until_json_closes_stops_at_close():
+    resp = _ndjson('{"a": ', '{"b": "}"}', '}', ' trailing prose', ' more')
+    with patch('ai.ollama_client._open_chat', return_value=_opened(resp)):
+        text, model, _ = ask_until_json_closes('sys', 'user')
+    assert text == '{"a": {"b": "}"}}'
+    assert model == 'test-model'
+    assert resp.closed
+
+
+def test_until_json_closes_continues_if_unparseable():
+    """A bracket closing in leading prose doesn't end the stream."""
+    resp = _ndjson('Step [x] then ', '{"a": 1}')
+    with patch('ai.ollama_client._open_chat', return_value=_opened(resp)):
+        text, _, _ = ask_until_json_closes('sys', 'user')
+    assert text == 'Step [x] then {"a": 1}'
+
+
+def test_until_json_closes_no_json():
+    with patch('ai.ollama_client._open_chat',
+               return_value=_opened(_ndjson('just ', 'text'))):
+        text, _, _ = ask_until_json_closes('sys', 'user')
+    assert text == 'just text'
+
+
+# --- keep-alive transport against a local HTTP/1.1 server ---
+
+class _ChatHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    peers = []
+    drop_idle = False  # close the socket after responding, without telling the client
+
+    def do_POST(self):
+        _ChatHandler.peers.append(self.client_address)
+        self.rfile.read(int(self.headers['Content-Length']))
+        body = _ndjson('h', 'i').getvalue()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if _ChatHandler.drop_idle:
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def chat_server(monkeypatch):
+    from ai import ollama_client
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _ChatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ollama_client.close_connections()
+    monkeypatch.setattr(ollama_client, '_URL',
+                        urllib.parse.urlsplit(f'http://127.0.0.1:{server.server_port}'))
+    _ChatHandler.peers = []
+    _ChatHandler.drop_idle = False
+    yield _ChatHandler.peers
+    _ChatHandler.drop_idle = False
+    ollama_client.close_connections()
+    server.shutdown()
+    server.server_close()
+
+
+def test_ask_reuses_connection(chat_server):
+    assert ask('sys', 'a')[0] == 'hi'
+    assert ask('sys', 'b')[0] == 'hi'
+    list(ask_stream('sys', 'c'))
+    assert ask('sys', 'd')[0] == 'hi'
+    assert len(chat_server) == 4
+    assert len(set(chat_server)) == 1
+
+
+def test_reconnects_after_server_closes_connection(chat_server):
+    _ChatHandler.drop_idle = True
+    assert ask('sys', 'a')[0] == 'hi'
+    assert ask('sys', 'b')[0] == 'hi'
+    assert len(set(chat_server)) == 2
+
+
+def test_connection_shared_across_threads(chat_server):
+    """A finished thread's connection goes back to the pool for the next one."""
+    from ai import ollama_client
+    for user in ('a', 'b', 'c'):
+        t = threading.Thread(target=ask, args=('sys', user))
+        t.start()
+        t.join()
+    assert len(chat_server) == 3
+    assert len(set(chat_server)) == 1
+    assert len(ollama_client._idle) == 1
+
+
+def test_idle_pool_is_bounded(chat_server, monkeypatch):
+    from ai import ollama_client
+    monkeypatch.setattr(ollama_client, 'OLLAMA_NUM_PARALLEL', 2)
+    conns = [ollama_client._checkout()[0] for _ in range(4)]
+    for conn in conns:
+        ollama_client._checkin(conn)
+    assert ollama_client._idle == conns[:2]
@@ -7,14 +7,17 @@ Test categories:
   4. Attempt snapshots — skill_rating_before/after per attempt
   5. Answer service integration — end-to-end persistence
   6. Session resume — load state from DB when flask_session is empty
+  7. Transactions — grouped writes commit or roll back together
 """
 import json
 
+import pytest
+
 from models import (
     student, topic, curriculum_node, question, attempt,
     student_skill, session,
 )
-from db.database import query_db
+from db.database import execute_db, execute_many, query_db, transaction
 
 
 # ---------------------------------------------------------------------------
@@ -472,3 +475,30 @@ class TestSessionResume:
         assert sess['total_questions'] == 2
         assert sess['total_correct'] == 1
         assert sess['ended_at'] is not None
+
+
+# ===========================================================================
+# 8. Transactions
+# ===========================================================================
+
+def test_transaction_commits_all_writes_once():
+    with transaction():
+        execute_db("INSERT INTO students (name) VALUES (?)", ('Tx A',))
+        execute_db("INSERT INTO students (name) VALUES (?)", ('Tx B',))
+    names = {r['name'] for r in query_db("SELECT name FROM students")}
+    assert {'Tx A', 'Tx B'} <= names
+
+
+def test_transaction_rolls_back_on_error():
+    with pytest.raises(RuntimeError):
+        with transaction():
+            execute_db("INSERT INTO students (name) VALUES (?)", ('Rolled Back',))
+            raise RuntimeError('boom')
+    assert query_db("SELECT * FROM students WHERE name = ?", ('Rolled Back',)) == []
+
+
+def test_execute_many():
+    count = execute_many("INSERT INTO students (name) VALUES (?)",
+                         [('Many 1',), ('Many 2',), ('Many 3',)])
+    assert count == 3
+    assert len(query_db("SELECT * FROM students WHERE name LIKE 'Many %'")) == 3
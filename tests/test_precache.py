@@ -1,5 +1,8 @@
 """Tests for dual question pre-caching (correct/wrong paths)."""
-from services.question_service import _precache, _precache_lock, pop_cached
+import threading
+from unittest.mock import patch
+
+from services.question_service import _precache, _precache_lock, pop_cached, precache_next
 
 
 def _make_question(node_id=1, node_name='Addition', difficulty=800):
@@ -150,3 +153,26 @@ def test_pop_default_is_correct_path():
     _seed_dual(1, 'sess-1', q_correct, q_wrong)
     result = pop_cached(1, 'sess-1')
     assert result['difficulty'] == 850
+
+
+# --- precache_next ---
+
+def test_precache_next_generates_both_paths_concurrently():
+    """Both outcome paths are in flight at once and cached under their outcome."""
+    _clear_cache()
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_generate_next(session_id, student, topic_id, store_in_session=True,
+                           skill_overrides=None, last_was_correct=None):
+        barrier.wait()  # Fails with BrokenBarrierError if run one at a time
+        assert store_in_session is False
+        return _make_question(node_name='correct' if last_was_correct else 'wrong')
+
+    with patch('services.question_service.generate_next', side_effect=fake_generate_next):
+        precache_next('sess-1', {'id': 1}, 1, current_question=_make_question())
+
+    with _precache_lock:
+        cached = _precache[(1, 'sess-1')]
+    assert cached['correct']['node_name'] == 'correct'
+    assert cached['wrong']['node_name'] == 'wrong'
+    _clear_cache()
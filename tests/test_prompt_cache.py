@@ -0,0 +1,65 @@
+"""Tests for ai/prompt_cache.py and its use in ollama_client.ask."""
+import http.client
+import io
+import json
+from unittest.mock import MagicMock, patch
+
+from ai import prompt_cache
+from ai.ollama_client import ask
+
+
+def _fake_open_chat(payload):
+    resp = io.BytesIO((json.dumps({
+        'message': {'content': '{"ok": true}'},
+        'model': 'test-model',
+        'done': True,
+        'eval_count': 3,
+    }) + '\n').encode())
+    return resp, MagicMock(spec=http.client.HTTPConnection)
+
+
+def test_put_then_get():
+    key = prompt_cache.make_key('m', 'sys', 'user', 0.3, 512)
+    assert prompt_cache.get(key) is None
+    prompt_cache.put(key, 'hello', 'm')
+    assert prompt_cache.get(key) == ('hello', 'm')
+
+
+def test_key_depends_on_all_inputs():
+    base = prompt_cache.make_key('m', 'sys', 'user', 0.3, 512)
+    assert base == prompt_cache.make_key('m', 'sys', 'user', 0.3, 512)
+    assert base != prompt_cache.make_key('m2', 'sys', 'user', 0.3, 512)
+    assert base != prompt_cache.make_key('m', 'sys', 'user2', 0.3, 512)
+    assert base != prompt_cache.make_key('m', 'sys', 'user', 0.2, 512)
+    assert base != prompt_cache.make_key('m', 'sys', 'user', 0.3, 256)
+
+
+def test_expired_entry_ignored(monkeypatch):
+    key = prompt_cache.make_key('m', 'sys', 'user', 0.3, 512)
+    prompt_cache.put(key, 'hello', 'm')
+    monkeypatch.setattr(prompt_cache, 'PROMPT_CACHE_TTL', 60)
+    with patch('ai.prompt_cache.time.time', return_value=10**12):
+        assert prompt_cache.get(key) is None
+        assert prompt_cache.clear(expired_only=True) == 1
+
+
+def test_clear():
+    prompt_cache.put('a', 'x', 'm')
+    prompt_cache.put('b', 'y', 'm')
+    assert prompt_cache.clear() == 2
+    assert prompt_cache.get('a') is None
+
+
+@patch('ai.ollama_client._open_chat', side_effect=_fake_open_chat)
+def test_ask_low_temperature_hits_cache(mock_open):
+    first = ask('sys', 'user', temperature=0.2)
+    second = ask('sys', 'user', temperature=0.2)
+    assert first == second
+    assert mock_open.call_count == 1
+
+
+@patch('ai.ollama_client._open_chat', side_effect=_fake_open_chat)
+def test_ask_high_temperature_skips_cache(mock_open):
+    ask('sys', 'user', temperature=0.7)
+    ask('sys', 'user', temperature=0.7)
+    assert mock_open.call_count == 2
@@ -118,6 +118,22 @@ def test_dedup_rejects_repeated_question(mock_gen, app):
     assert result2 is None
 
 
+@patch('ai.question_generator.ask_until_json_closes')
+def test_rejected_question_not_served_from_cache(mock_ask, app):
+    """A question validation rejects is never cached for later generate() calls."""
+    from ai import question_generator
+
+    bad = '{"question": "What is 7 + 5?", "correct_answer": "13"}'
+    good = '{"question": "What is 6 + 2?", "correct_answer": "8"}'
+    mock_ask.side_effect = [(bad, 'm', 'p'), (good, 'm', 'p'), (good, 'm', 'p')]
+    student, topic_id, node_id, session_id = _setup(app)
+    with app.test_request_context():
+        result = question_service.generate_next(session_id, student, topic_id)
+    assert result['content'] == 'What is 6 + 2?'
+    cached = [entry[1]['question'] for entry in question_generator._question_cache.values()]
+    assert cached == ['What is 6 + 2?']
+
+
 @patch('services.question_service.question_generator.generate')
 def test_question_stored_in_db(mock_gen, app):
     mock_gen.side_effect = _mock_generator(_valid_q_data())
@@ -151,6 +151,25 @@ class TestIsSimilarToAny:
         # Should be one of the addition questions
         assert "+" in similar_q or "add" in similar_q.lower()
 
+    def test_first_match_stops_at_threshold(self):
+        """first_match returns the first question over the threshold."""
+        is_similar, similar_q, score = is_similar_to_any(
+            "What is 5 + 3?",
+            ["What is the capital of France?", "What is 7 + 2 ?", "What is 7 + 2?"],
+            threshold=0.6,
+            first_match=True,
+        )
+        assert is_similar is True
+        assert similar_q == "What is 7 + 2 ?"
+        assert score >= 0.6
+
+    def test_first_match_accepts_set(self):
+        """Callers can pass a set of texts directly."""
+        is_similar, _, _ = is_similar_to_any(
+            "What is 5 + 3?", {"What is 7 + 2?"}, threshold=0.7, first_match=True
+        )
+        assert is_similar is True
+
 
 class TestAvoidingSimilarQuestions:
     """Integration tests for the main use case."""
@@ -3,6 +3,7 @@ from engine.question_validator import (
     validate_question, verify_math_answer, verify_explanation_vs_answer,
     verify_explanation_arithmetic, _extract_explanation_results,
     _try_compute_answer, _resolve_answer_text, _parse_numeric, _safe_eval_expr,
+    _validate_cached, _strip_letter_prefix,
 )
 
 
@@ -367,6 +368,23 @@ def test_empty_choices_list_accepted():
     assert ok
 
 
+def test_repeat_validation_is_cached():
+    q = _q(question='What is the capital of Spain?', correct_answer='B) Madrid',
+           options=['A) Paris', 'B) Madrid', 'C) Rome', 'D) Lisbon'])
+    first = validate_question(q)
+    hits = _validate_cached.cache_info().hits
+    assert validate_question(dict(q)) == first
+    assert _validate_cached.cache_info().hits == hits + 1
+
+
+def test_uncacheable_fields_still_validated():
+    """Non-str answers bypass the cache and validate as before."""
+    ok, _ = validate_question(_q(question='What is 7 * 8?', correct_answer=56))
+    assert ok
+    ok, reason = validate_question(_q(question='What is 7 * 8?', correct_answer=57))
+    assert not ok and 'Math verification failed' in reason
+
+
 # === Rule 13: Mathematical answer verification ===
 
 # --- _safe_eval_expr ---
@@ -398,6 +416,21 @@ def test_safe_eval_rejects_letters():
 def test_safe_eval_empty():
     assert _safe_eval_expr('') is None
 
+def test_safe_eval_precedence_and_unary_minus():
+    assert _safe_eval_expr('2 + 3 * 4 - 10 / 5') == 12.0
+    assert _safe_eval_expr('7 - 2 - 1') == 4
+    assert _safe_eval_expr('2 * -3') == -6
+    assert _safe_eval_expr('--5') == 5
+
+def test_safe_eval_rejects_python_only_syntax():
+    """Anything Python wouldn't accept as a plain literal/operator stays None."""
+    for expr in ('07 + 1', '2 ** 3', '8 // 2', '+5', '1.2.3', '5 +', '1 2'):
+        assert _safe_eval_expr(expr) is None, expr
+
+def test_safe_eval_floats():
+    assert _safe_eval_expr('1.5 + .5') == 2.0
+    assert _safe_eval_expr('00 + 1.') == 1.0
+
 
 # --- _parse_numeric ---
 
@@ -419,6 +452,15 @@ def test_parse_numeric_empty():
 
 # --- _resolve_answer_text ---
 
+def test_strip_letter_prefix():
+    assert _strip_letter_prefix('B) Paris') == 'Paris'
+    assert _strip_letter_prefix('c.  cat') == 'cat'
+    assert _strip_letter_prefix('A cat') == 'cat'
+    assert _strip_letter_prefix('Apple') == 'Apple'
+    assert _strip_letter_prefix('E) 5') == 'E) 5'
+    assert _strip_letter_prefix('D') == 'D'
+
+
 def test_resolve_letter_prefix():
     assert _resolve_answer_text('D) 9', []) == '9'
 
@@ -499,6 +541,9 @@ def test_compute_missing_number_right_sub():
 def test_compute_missing_number_question_mark():
     assert _try_compute_answer('? + 5 = 12') == 7
 
+def test_compute_missing_number_first_equation_wins():
+    assert _try_compute_answer('Solve: 9 - __ = 4 and __ + 2 = 5') == 5
+
 def test_compute_equation_form():
     assert _try_compute_answer('8 + 9 = ?') == 17
 
@@ -546,6 +591,10 @@ def test_verify_wrong_subtraction():
     assert not ok
     assert 'computes to 8' in reason
 
+def test_verify_skips_question_without_digits():
+    ok, reason = verify_math_answer(_q('How do you spell seven?', '7'))
+    assert ok and reason == ''
+
 def test_verify_wrong_less_than():
     """The screenshot bug: 'What number is 7 less than 15?' answer D) 9."""
     ok, reason = verify_math_answer(